@@ -0,0 +1,115 @@
+import hashlib
+import os
+import struct
+import threading
+import pygame
+from game_log import get_logger
+from settings import ASSET_CACHE_DIR, ASSET_CACHE_ENABLED
+
+log = get_logger("asset_cache")
+
+FORMAT_VERSION = 1
+MAGIC = b"SOTLRAW1"
+HEADER = struct.Struct("<8s4sI")   # magic, pixel format, frame count
+FRAME = struct.Struct("<II")       # width, height
+
+
+class AssetCache:
+    """On-disk cache of scaled, pre-sliced frames stored as raw pixels.
+
+    An entry is keyed by the blake2 hash of the source file plus a `variant`
+    tuple describing what was built from it (loader, scale, slicing). Loading
+    a hit is a file read and frombuffer per frame, with no PNG decode and no
+    resampling. Editing the source art changes its hash, so the entry misses,
+    is rebuilt and replaces the stale file for that source/variant.
+    """
+
+    def __init__(self, cache_dir=ASSET_CACHE_DIR, enabled=ASSET_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.hashes = {}  # (path, mtime_ns, size) -> digest, so each file is hashed once per run
+        self.hits = 0
+        self.misses = 0
+
+    def source_hash(self, path):
+        st = os.stat(path)
+        key = (path, st.st_mtime_ns, st.st_size)
+        digest = self.hashes.get(key)
+        if digest is None:
+            with open(path, "rb") as f:
+                digest = self.hashes[key] = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        return digest
+
+    def entry_prefix(self, source, variant):
+        name = os.path.splitext(os.path.normpath(source))[0].replace(os.sep, "_")
+        variant_id = hashlib.blake2b(repr((FORMAT_VERSION, variant)).encode(), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}-{variant_id}-")
+
+    def entry_path(self, source, variant):
+        return self.entry_prefix(source, variant) + self.source_hash(source) + ".bin"
+
+    def read(self, source, variant):
+        """Cached frames as plain surfaces (not display-converted), or None. Safe off the main thread."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self.entry_path(source, variant), "rb") as f:
+                data = memoryview(f.read())
+            magic, fmt, count = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                return None
+            fmt = fmt.rstrip(b"\0").decode()
+            bpp = len(fmt)
+            frames = []
+            offset = HEADER.size
+            for _ in range(count):
+                w, h = FRAME.unpack_from(data, offset)
+                offset += FRAME.size
+                size = w * h * bpp
+                frames.append(pygame.image.frombuffer(data[offset:offset + size], (w, h), fmt))
+                offset += size
+            return frames
+        except (OSError, struct.error, ValueError, pygame.error):
+            return None
+
+    def write(self, source, variant, frames, alpha=True):
+        if not self.enabled:
+            return
+        fmt = "RGBA" if alpha else "RGB"
+        path = self.entry_path(source, variant)
+        prefix = self.entry_prefix(source, variant)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # the map prefetch thread and the main thread can write the same entry at once
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, fmt.encode(), len(frames)))
+                for frame in frames:
+                    f.write(FRAME.pack(*frame.get_size()))
+                    f.write(pygame.image.tobytes(frame, fmt))
+            os.replace(tmp, path)
+            # drop entries built from older versions of the same source
+            folder, stem = os.path.split(prefix)
+            for name in os.listdir(folder):
+                stale = os.path.join(folder, name)
+                if name.startswith(stem) and name.endswith(".bin") and stale != path:
+                    os.remove(stale)
+        except OSError as e:
+            log.warn("Could not write asset cache entry for %s: %s", source, e)
+
+    def load_frames(self, source, variant, build, alpha=True):
+        """Frames for `source`/`variant`, display-converted; `build()` makes them on a miss."""
+        frames = self.read(source, variant)
+        if frames is not None:
+            self.hits += 1
+            return [f.convert_alpha() if alpha else f.convert() for f in frames]
+        self.misses += 1
+        frames = build()
+        self.write(source, variant, frames, alpha)
+        return frames
+
+    def load_surface(self, source, variant, build, alpha=True):
+        return self.load_frames(source, variant, lambda: [build()], alpha)[0]
+
+
+asset_cache = AssetCache()
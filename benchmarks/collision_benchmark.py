@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+import time
+import pygame
+from collisions import CollisionHandler
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+BODY_COUNTS = [10, 100, 1000]
+QUERIES = 5000
+HITBOX_SIZE = (65, 50)
+PROBE_SIZE = (60, 120)
+RADIUS = 150
+
+
+def linear_check(rects, rect):
+    for obstacle in rects:
+        if rect.colliderect(obstacle):
+            return True
+    return False
+
+
+def linear_rect(rects, rect):
+    return [other for other in rects if rect.colliderect(other)]
+
+
+def linear_radius(rects, center, radius):
+    cx, cy = center
+    hits = []
+    for other in rects:
+        nx = min(max(cx, other.left), other.right)
+        ny = min(max(cy, other.top), other.bottom)
+        if (nx - cx) ** 2 + (ny - cy) ** 2 <= radius * radius:
+            hits.append(other)
+    return hits
+
+
+def timed(fn, probes):
+    start = time.perf_counter()
+    for probe in probes:
+        fn(probe)
+    return (time.perf_counter() - start) / len(probes) * 1e6
+
+
+def run(count, rng):
+    static_rects = [pygame.Rect(0, 0, SCREEN_WIDTH, 20), pygame.Rect(0, SCREEN_HEIGHT - 20, SCREEN_WIDTH, 20)]
+    bodies = [pygame.Rect(rng.randint(0, SCREEN_WIDTH), rng.randint(20, SCREEN_HEIGHT - 20), *HITBOX_SIZE)
+              for _ in range(count)]
+    probes = [pygame.Rect(rng.randint(0, SCREEN_WIDTH), rng.randint(20, SCREEN_HEIGHT - 20), *PROBE_SIZE)
+              for _ in range(QUERIES)]
+
+    handler = CollisionHandler(static_rects)
+    handler.add_dynamic(bodies)
+    everything = static_rects + bodies
+
+    return [
+        ("check", timed(lambda p: linear_check(static_rects + bodies, p), probes),
+         timed(handler.check_collision, probes)),
+        ("rect", timed(lambda p: linear_rect(everything, p), probes),
+         timed(handler.query_rect, probes)),
+        ("radius", timed(lambda p: linear_radius(everything, p.center, RADIUS), probes),
+         timed(lambda p: handler.query_radius(p.center, RADIUS), probes)),
+    ]
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'bodies':>7} {'query':>7} {'linear us':>10} {'hashed us':>10} {'speedup':>8}")
+    for count in BODY_COUNTS:
+        for name, linear, hashed in run(count, rng):
+            print(f"{count:>7} {name:>7} {linear:>10.2f} {hashed:>10.2f} {linear / hashed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
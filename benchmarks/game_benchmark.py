@@ -0,0 +1,367 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import pygame
+import game_clock
+from headless import FIXED_DT, ScriptedInput, init_headless, parse_script
+from enemy_profiles import ENEMY_PROFILES
+from map_profiles import MAP_PROFILES
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SEED = 0
+WARMUP_FRAMES = 60
+FRAMES = 900
+CROWD_MAP = "battleground"
+# open floor of every map (the walls are rows 0-730 and 1060+)
+FLOOR = pygame.Rect(60, 760, SCREEN_WIDTH - 120, 280)
+PLAYER_POS = (SCREEN_WIDTH // 2, 880)
+PERCENTILES = (50, 95, 99)
+# a whole crowd can land more than max_hp in one frame; the HP bar clamps to its own maximum
+PLAYER_HP = 10 ** 6
+
+
+def crowd(count, clear_radius=0):
+    """`count` slimes spread over the floor, cycling through ENEMY_PROFILES and both AI types."""
+    sprites = list(ENEMY_PROFILES)
+    cols = max(1, int((count * FLOOR.width / FLOOR.height) ** 0.5))
+    rows = -(-count // cols)
+    data = []
+    for i in range(count):
+        row, col = divmod(i, cols)
+        x = FLOOR.left + (col + 0.5) * FLOOR.width / cols
+        y = FLOOR.top + (row + 0.5) * FLOOR.height / rows
+        if clear_radius and abs(x - PLAYER_POS[0]) < clear_radius:
+            # keep a gap around the player so the crowd walks in rather than spawning on top
+            x += clear_radius if x >= PLAYER_POS[0] else -clear_radius
+        data.append({"x": int(x), "y": int(y), "type": ("melee", "range")[i % 2],
+                     "sprite": sprites[i % len(sprites)]})
+    return data
+
+
+def spawn_crowd(scene, count, clear_radius=0):
+    scene.enemy_manager.spawn_from_data(crowd(count, clear_radius), scene.player)
+
+
+class Scenario:
+    """A named stress case: the map and input script it starts from, plus setup/per-frame hooks.
+
+    setup(scene, count) runs once after the scene is built, step(scene, frame) before
+    every frame; both default to nothing. extra(scene) adds scenario-specific numbers
+    to the report.
+    """
+
+    def __init__(self, name, description, map_name=CROWD_MAP, script="", count=0,
+                 setup=None, step=None, extra=None):
+        self.name = name
+        self.description = description
+        self.map_name = map_name
+        self.script = script
+        self.count = count
+        self.setup = setup
+        self.step = step
+        self.extra = extra
+
+
+def _setup_slimes(scene, count):
+    spawn_crowd(scene, count, clear_radius=200)
+
+
+def _setup_flurry(scene, count):
+    spawn_crowd(scene, count, clear_radius=300)
+
+
+def _setup_exp(scene, count):
+    spawn_crowd(scene, count)
+
+
+def _step_exp(scene, frame):
+    # every enemy drops its EXP (4-6 stars) twice a second without dying, so the crowd keeps dropping
+    if frame % 30 == 0:
+        for enemy in scene.enemy_manager.enemies:
+            enemy.spawn_exp(scene.player)
+
+
+def _extra_exp(scene):
+    from enemy import global_exp_stars
+    return {"exp_stars_left": len(global_exp_stars)}
+
+
+class TransitionLoop:
+    """Starts the next map transition as soon as the previous one is done, cycling through MAP_PROFILES."""
+
+    def __init__(self):
+        self.targets = []
+        self.current = None
+        self.tti_ms = []
+
+    def setup(self, scene, count):
+        start = scene.current_map.name
+        self.current = None
+        self.tti_ms = []
+        self.targets = [name for name in MAP_PROFILES if name != start] + [start]
+
+    def step(self, scene, frame):
+        from map_transition import MapTransition
+        if scene.transition is not None:
+            return
+        if self.current is not None:
+            self.tti_ms.append(self.current.tti_ms)
+        target = self.targets[len(self.tti_ms) % len(self.targets)]
+        self.current = scene.transition = MapTransition({"target_map": target, "player_pos": PLAYER_POS},
+                                                        (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def extra(self, scene):
+        return {"transitions": len(self.tti_ms), "tti_ms": summarize(self.tti_ms)}
+
+
+def _extra_pools(scene):
+    return scene.skill_effect_manager.pool_stats()
+
+
+_transitions = TransitionLoop()
+SCENARIOS = {scenario.name: scenario for scenario in (
+    Scenario("slimes", "N slimes from ENEMY_PROFILES chasing an idle player", count=200,
+             setup=_setup_slimes),
+    Scenario("note_flurry", "Note Flurry fired every cooldown into a crowd", count=40,
+             script="right:1," + "f:1,:9," * (FRAMES // 10), setup=_setup_flurry, extra=_extra_pools),
+    Scenario("exp_drops", "the whole crowd drops EXP stars twice a second", count=60,
+             setup=_setup_exp, step=_step_exp, extra=_extra_exp),
+    Scenario("soundquake", "full-charge Soundquake released into a crowd, on cooldown", count=120,
+             script="a:185,:185," * (FRAMES // 370 + 1), setup=_setup_slimes, extra=_extra_pools),
+    Scenario("transitions", "back-to-back map transitions through every map in MAP_PROFILES",
+             map_name="tutorial_hall", setup=_transitions.setup, step=_transitions.step,
+             extra=_transitions.extra),
+)}
+
+
+def summarize(samples):
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    summary = {"mean": sum(ordered) / len(ordered), "max": ordered[-1]}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = ordered[min(last, int(p / 100 * len(ordered)))]
+    return summary
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def build_scene(scenario, count):
+    from scene_manager import SceneManager
+    from scenes.game_scene import GameScene
+    from enemy import global_exp_stars
+
+    random.seed(SEED)
+    game_clock.use_fixed_clock()
+    global_exp_stars.clear()
+    screen = pygame.display.get_surface()
+    scene = GameScene(screen, map_name=scenario.map_name, headless=True, fixed_dt=FIXED_DT,
+                      input_source=ScriptedInput(parse_script(scenario.script)))
+    SceneManager(scene)
+    scene.on_enter()
+    scene.player.rect.center = PLAYER_POS
+    if scenario.setup:
+        scenario.setup(scene, count)
+    return scene
+
+
+def play(scenario, count, frames, warmup, trace):
+    """Runs one pass; with `trace` each frame's allocations are measured under tracemalloc instead of timed."""
+    scene = build_scene(scenario, count)
+    frame_ms = []
+    update_ms = []
+    blocks = []
+    alloc_kb = []
+    played = 0
+    collections = None
+    if trace:
+        tracemalloc.start()
+    for frame in range(warmup + frames):
+        # the player can't die mid-benchmark, or the run would end on the game over screen
+        scene.player.hp = PLAYER_HP
+        if scenario.step:
+            scenario.step(scene, frame)
+        measured = frame >= warmup
+        if trace and measured:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+        start_blocks = sys.getallocatedblocks()
+        start = time.perf_counter()
+        scene.update()
+        updated = time.perf_counter()
+        scene.draw()
+        end = time.perf_counter()
+        if not measured:
+            continue
+        if collections is None:
+            collections = [stat["collections"] for stat in gc.get_stats()]
+        played += 1
+        if trace:
+            alloc_kb.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+        else:
+            update_ms.append((updated - start) * 1000)
+            frame_ms.append((end - start) * 1000)
+            blocks.append(sys.getallocatedblocks() - start_blocks)
+    if trace:
+        tracemalloc.stop()
+    gc_runs = [stat["collections"] - before for stat, before in zip(gc.get_stats(), collections or ())]
+    return scene, played, frame_ms, update_ms, blocks, alloc_kb, gc_runs
+
+
+def run_scenario(scenario, count, frames, warmup, trace=True):
+    scene, played, frame_ms, update_ms, blocks, _, gc_runs = play(scenario, count, frames, warmup, trace=False)
+    result = {
+        "description": scenario.description,
+        "map": scenario.map_name,
+        "count": count,
+        "frames": played,
+        "enemies": len(scene.enemy_manager.enemies),
+        "frame_ms": summarize(frame_ms),
+        "update_ms": summarize(update_ms),
+        "draw_ms": summarize([f - u for f, u in zip(frame_ms, update_ms)]),
+        "net_blocks_per_frame": sum(blocks) / len(blocks) if blocks else 0,
+        "gc_collections": gc_runs,
+    }
+    if scenario.extra:
+        result.update(scenario.extra(scene))
+    if trace:
+        # tracemalloc slows every allocation down, so it gets a pass of its own
+        alloc_kb = play(scenario, count, frames, warmup, trace=True)[5]
+        result["alloc_kb_per_frame"] = summarize(alloc_kb)
+    result["peak_rss_kb"] = peak_rss_kb()
+    return result
+
+
+def run_child(name, count, frames, warmup, trace, out):
+    init_headless()
+    scenario = SCENARIOS[name]
+    result = run_scenario(scenario, scenario.count if count is None else count, frames, warmup, trace)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    pygame.quit()
+
+
+def run_isolated(name, args):
+    """Runs a scenario in a fresh interpreter so peak RSS and caches belong to it alone."""
+    fd, out = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, "--frames", str(args.frames),
+               "--warmup", str(args.warmup), "--child-out", out]
+    if args.count is not None:
+        command += ["--count", str(args.count)]
+    if args.no_tracemalloc:
+        command.append("--no-tracemalloc")
+    try:
+        subprocess.run(command, check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(out)
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def environment(args):
+    import numpy
+    return {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "frames": args.frames,
+        "warmup": args.warmup,
+        "dt_ms": FIXED_DT,
+    }
+
+
+def print_table(results, baseline=None):
+    header = f"{'scenario':<12} {'count':>5} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'max ms':>7} " \
+             f"{'alloc KB':>9} {'blocks':>7} {'RSS MB':>7}"
+    if baseline:
+        header += f" {'p95 vs base':>12}"
+    print(header)
+    for name, r in results.items():
+        ms = r["frame_ms"]
+        alloc = r.get("alloc_kb_per_frame", {}).get("p50")
+        rss = r["peak_rss_kb"]
+        line = (f"{name:<12} {r['count']:>5} {ms['p50']:>7.2f} {ms['p95']:>7.2f} {ms['p99']:>7.2f} "
+                f"{ms['max']:>7.2f} {'-' if alloc is None else f'{alloc:.1f}':>9} "
+                f"{r['net_blocks_per_frame']:>7.1f} {'-' if rss is None else f'{rss / 1024:.0f}':>7}")
+        base = (baseline or {}).get(name)
+        if base:
+            change = (ms["p95"] / base["frame_ms"]["p95"] - 1) * 100
+            line += f" {change:>+11.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless stress scenarios: frame time percentiles, "
+                                                 "allocations per frame and peak RSS.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only this scenario (repeatable); default is all of them")
+    parser.add_argument("--count", type=int, default=None, help="override the crowd size of every scenario")
+    parser.add_argument("--frames", type=int, default=FRAMES, help="measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=WARMUP_FRAMES, help="frames played before measuring")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="skip the allocation pass")
+    parser.add_argument("--out", default="benchmark_results.json", help="write the results here")
+    parser.add_argument("--compare", default="", help="an earlier results file to compare p95 frame times with")
+    parser.add_argument("--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--child-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.count, args.frames, args.warmup, not args.no_tracemalloc, args.child_out)
+        return
+    if args.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:<12} {scenario.description}")
+        return
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        print(f"[BENCH] {name} ...", flush=True)
+        results[name] = run_isolated(name, args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["scenarios"]
+    print_table(results, baseline)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(args), "scenarios": results}, f, indent=2)
+    print(f"[BENCH] results written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
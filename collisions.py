@@ -1,23 +1,184 @@
 import pygame
 
+CELL_SIZE = 128
+# up to this many rects a flat scan beats working out grid cells (see benchmarks/collision_benchmark.py)
+LINEAR_SCAN_MAX = 64
+
+
+def segment_entry(x0, y0, x1, y1, rect):
+    """How far (0..1) along (x0, y0)->(x1, y1) the segment first enters `rect`, or None if it never does.
+
+    A zero-length segment is a point test with Rect.collidepoint's half-open edges.
+    """
+    t_enter, t_exit = 0.0, 1.0
+    for start, delta, low, high in ((x0, x1 - x0, rect.left, rect.right),
+                                    (y0, y1 - y0, rect.top, rect.bottom)):
+        if delta == 0:
+            if not low <= start < high:
+                return None
+            continue
+        a = (low - start) / delta
+        b = (high - start) / delta
+        if a > b:
+            a, b = b, a
+        t_enter = max(t_enter, a)
+        t_exit = min(t_exit, b)
+        if t_enter >= t_exit:
+            return None
+    return t_enter
+
+
 class CollisionHandler:
-    def __init__(self, collidables):
+    def __init__(self, collidables, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
         self.static_rects = collidables
-        self.dynamic_objects = []
+        self.cells = {}           # (cx, cy) -> {id(rect): rect}
+        self.dynamic_bodies = {}  # id(rect) -> (rect, cell range it is binned under)
+        self._flat = None         # every rect in one list for small rooms; rebuilt when rects come or go
+
+        for rect in self.static_rects:
+            self._insert(rect, self._cell_range(rect))
+
+    @property
+    def dynamic_objects(self):
+        return [rect for rect, _ in self.dynamic_bodies.values()]
+
+    @dynamic_objects.setter
+    def dynamic_objects(self, rects):
+        self.clear_dynamic()
+        self.add_dynamic(rects)
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.left, rect.right - 1) // size, max(rect.top, rect.bottom - 1) // size)
+
+    def _insert(self, rect, cell_range):
+        x0, y0, x1, y1 = cell_range
+        key = id(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                self.cells.setdefault((cx, cy), {})[key] = rect
+
+    def _remove(self, rect, cell_range):
+        x0, y0, x1, y1 = cell_range
+        key = id(rect)
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    continue
+                cell.pop(key, None)
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def _all_rects(self):
+        """Every rect as one list when there are few enough to scan directly, else None."""
+        if len(self.static_rects) + len(self.dynamic_bodies) > LINEAR_SCAN_MAX:
+            return None
+        if self._flat is None:
+            self._flat = self.static_rects + [rect for rect, _ in self.dynamic_bodies.values()]
+        return self._flat
+
+    def _nearby(self, rect):
+        flat = self._all_rects()
+        return flat if flat is not None else self._candidates(self._cell_range(rect))
+
+    def _candidates(self, cell_range):
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), {}).values()
+        found = {}
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found.values()
 
     def add_dynamic(self, dynamic_rects):
-        self.dynamic_objects.extend(dynamic_rects)
+        for rect in dynamic_rects:
+            if id(rect) in self.dynamic_bodies:
+                continue
+            cell_range = self._cell_range(rect)
+            self.dynamic_bodies[id(rect)] = (rect, cell_range)
+            self._insert(rect, cell_range)
+            self._flat = None
+
+    def update_dynamic(self, rect):
+        entry = self.dynamic_bodies.get(id(rect))
+        if entry is None:
+            return
+        new_range = self._cell_range(rect)
+        if new_range != entry[1]:
+            self._remove(rect, entry[1])
+            self._insert(rect, new_range)
+            self.dynamic_bodies[id(rect)] = (rect, new_range)
 
     def check_collision(self, rect, dx=0, dy=0):
         test_rect = rect.move(dx, dy)
-        for obstacle in self.static_rects + self.dynamic_objects:
-            if test_rect.colliderect(obstacle):
-                return True
+        flat = self._all_rects()
+        if flat is not None:
+            return test_rect.collidelist(flat) != -1
+        x0, y0, x1, y1 = self._cell_range(test_rect)
+        cells = self.cells
+        colliderect = test_rect.colliderect
+        # a yes/no answer doesn't need de-duplication, so bail on the first hit
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    for other in cell.values():
+                        if colliderect(other):
+                            return True
         return False
 
+    def query_rect(self, rect):
+        return [other for other in self._nearby(rect) if rect.colliderect(other)]
+
+    def query_radius(self, center, radius):
+        cx, cy = center
+        bounds = pygame.Rect(int(cx - radius), int(cy - radius), int(radius * 2) + 1, int(radius * 2) + 1)
+        hits = []
+        for other in self._nearby(bounds):
+            if not bounds.colliderect(other):
+                continue
+            # closest point on the rect to the circle centre
+            nx = min(max(cx, other.left), other.right)
+            ny = min(max(cy, other.top), other.bottom)
+            if (nx - cx) ** 2 + (ny - cy) ** 2 <= radius * radius:
+                hits.append(other)
+        return hits
+
+    def query_segment(self, x0, y0, x1, y1):
+        """(t, rect) for every rect the segment enters, t being how far along it (0..1) it gets in."""
+        left, top = int(min(x0, x1)) - 1, int(min(y0, y1)) - 1
+        bounds = pygame.Rect(left, top, int(max(x0, x1)) + 2 - left, int(max(y0, y1)) + 2 - top)
+        hits = []
+        for other in self._nearby(bounds):
+            t = segment_entry(x0, y0, x1, y1, other)
+            if t is not None:
+                hits.append((t, other))
+        return hits
+
+    def remove_static(self, rect_to_remove):
+        # cells are keyed by id(), so match the same Rect object rather than an equal one
+        for i, rect in enumerate(self.static_rects):
+            if rect is rect_to_remove:
+                del self.static_rects[i]
+                self._remove(rect, self._cell_range(rect))
+                self._flat = None
+                return
+
     def remove_dynamic(self, rect_to_remove):
-        if rect_to_remove in self.dynamic_objects:
-            self.dynamic_objects.remove(rect_to_remove)
+        entry = self.dynamic_bodies.pop(id(rect_to_remove), None)
+        if entry is not None:
+            self._remove(rect_to_remove, entry[1])
+            self._flat = None
 
     def clear_dynamic(self):
-        self.dynamic_objects.clear()
\ No newline at end of file
+        for rect, cell_range in self.dynamic_bodies.values():
+            self._remove(rect, cell_range)
+        self.dynamic_bodies.clear()
+        self._flat = None
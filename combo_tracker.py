@@ -1,10 +1,46 @@
 from collections import deque
 from note_type import NoteType
+from skills_database import combo_database
+from text_cache import text_cache
 import pygame
 
+# milliseconds (these were 60 / 30 / 30 frames at 60 FPS)
+SUCCESS_MS = 1000  # a finished combo stays lit this long
+ALERT_MS = 500     # overflow warning
+COOLDOWN_MS = 500  # notes are ignored this long after a combo resolves
+
+# trie node key holding the name of the combo that ends there
+COMBO_END = None
+
+
+def build_combo_trie(combos):
+    """Compiles {combo name: requirement} into nested {NoteType: node} dicts.
+
+    Every requirement becomes one path from the root (see combo_database for how
+    it is read), so the tracker follows a single dict lookup per note however
+    many combos exist.
+    """
+    root = {}
+    for name, requirement in combos.items():
+        node = root
+        for note, count in requirement.items():
+            for _ in range(count):
+                node = node.setdefault(note, {})
+        if COMBO_END in node:
+            raise ValueError(f"Combos {node[COMBO_END]!r} and {name!r} use the same notes")
+        node[COMBO_END] = name
+    return root
+
+
+COMBO_TRIE = build_combo_trie(combo_database)
+
+
 class ComboTracker:
-    def __init__(self, timeout_ms=3000):
+    def __init__(self, timeout_ms=3000, trie=COMBO_TRIE):
         self.combo = deque()
+        self.trie = trie
+        self.node = trie        # None once the notes so far match no combo
+        self.completed = None   # name of the combo the notes finished, until reset()
         self.total_weight = 0.0
         self.timeout_ms = timeout_ms
         self.last_input_time = 0
@@ -20,6 +56,10 @@ class ComboTracker:
 
         note_weight = note_type.value["weight"]
         self.combo.append(note_type)
+        if self.node is not None:
+            self.node = self.node.get(note_type)
+            if self.node is not None and COMBO_END in self.node:
+                self.completed = self.node[COMBO_END]
         self.total_weight += note_weight
         self.last_input_time = current_time
         self.alert = False
@@ -27,38 +67,41 @@ class ComboTracker:
 
         if self.total_weight == 4.0:
             self.success = True
-            self.success_timer = 60
-            self.cooldown_timer = 30
+            self.success_timer = SUCCESS_MS
+            self.cooldown_timer = COOLDOWN_MS
             return "trigger"
 
         elif self.total_weight > 4.0:
             self.reset()
             self.alert = True
-            self.alert_timer = 30
-            self.cooldown_timer = 30
+            self.alert_timer = ALERT_MS
+            self.cooldown_timer = COOLDOWN_MS
             return "overflow"
 
         return "continue"
 
-    def update(self, current_time):
+    def update(self, current_time, dt):
         if self.combo and current_time - self.last_input_time > self.timeout_ms:
             self.reset()
 
         if self.success_timer > 0:
-            self.success_timer -= 1
-            if self.success_timer == 0:
+            self.success_timer -= dt
+            if self.success_timer <= 0:
                 self.reset()
 
         if self.alert_timer > 0:
-            self.alert_timer -= 1
-            if self.alert_timer == 0:
+            self.alert_timer -= dt
+            if self.alert_timer <= 0:
+                self.alert_timer = 0
                 self.alert = False
 
         if self.cooldown_timer > 0:
-            self.cooldown_timer -= 1
+            self.cooldown_timer = max(0, self.cooldown_timer - dt)
 
     def reset(self):
         self.combo.clear()
+        self.node = self.trie
+        self.completed = None
         self.total_weight = 0.0
         self.alert = False
         self.success = False
@@ -99,7 +142,7 @@ class ComboTracker:
         for note in self.combo:
             symbol = note.value["symbol"]
             color = note.value["color"]
-            text = font.render(symbol, True, color)
+            text = text_cache.render(font, symbol, color)
             screen.blit(text, (x, bar_y + (bar_height - text.get_height()) // 2))
             x += text.get_width() + 25
 
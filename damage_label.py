@@ -1,40 +1,82 @@
 import pygame
+from fonts import get_sysfont
+import game_clock
+from text_cache import text_cache
+from pool import ObjectPool
+from settings import DAMAGE_TEXT_POOL_SIZE, SPEED_FRAME_MS
+
+OUTLINE_COLOR = (255, 255, 255)
 
 class FloatingDamageText:
     def __init__(self, text, pos, color=(255, 0, 0), lifetime=600, rise_speed=0.3):
-        self.text = str(text)
-        self.x, self.y = pos
+        self.font = get_sysfont("Arial", 28, bold=True)
+        self.text = None
+        self.color = None
+        self.image = None
+        self.reset(text, pos, color, lifetime, rise_speed)
+
+    def reset(self, text, pos, color=(255, 0, 0), lifetime=600, rise_speed=0.3):
+        text = str(text)
+        # ✅ ตัวเลขพร้อมขอบขาว ประกอบครั้งเดียวตอนสร้าง เหลือแค่ alpha กับตำแหน่งที่เปลี่ยนทุกเฟรม
+        if self.image is None or text != self.text or color != self.color:
+            self.image = text_cache.render_outlined(self.font, text, color, OUTLINE_COLOR).copy()
+        self.text = text
         self.color = color
+        self.x, self.y = pos
         self.lifetime = lifetime  # milliseconds
         self.rise_speed = rise_speed
-        self.start_time = pygame.time.get_ticks()
-        self.font = pygame.font.SysFont("Arial", 28, bold=True)
+        self.start_time = game_clock.get_ticks()
 
-    def update(self):
-        self.y -= self.rise_speed
+    def update(self, dt):
+        # rise_speed is pixels per 60 Hz frame
+        self.y -= self.rise_speed * dt / SPEED_FRAME_MS
 
     def is_expired(self):
-        return pygame.time.get_ticks() - self.start_time > self.lifetime
+        return game_clock.get_ticks() - self.start_time > self.lifetime
 
     def draw(self, screen):
-        alpha = max(0, 255 - int((pygame.time.get_ticks() - self.start_time) / self.lifetime * 255))
-        text_surface = self.font.render(self.text, True, self.color)
-        text_surface.set_alpha(alpha)
-
-        # ✅ สร้างขอบขาว
-        outline_color = (255, 255, 255)
-        outline_surfaces = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx != 0 or dy != 0:
-                    s = self.font.render(self.text, True, outline_color)
-                    s.set_alpha(alpha)
-                    outline_surfaces.append((s, (self.x + dx, self.y + dy)))
-
-        # วาดขอบก่อน
-        for surf, pos in outline_surfaces:
-            screen.blit(surf, pos)
-
-        # วาดตัวเลขหลักทับตรงกลาง
-        screen.blit(text_surface, (self.x, self.y))
+        alpha = max(0, 255 - int((game_clock.get_ticks() - self.start_time) / self.lifetime * 255))
+        self.image.set_alpha(alpha)
+        return screen.blit(self.image, (self.x - 1, self.y - 1))
+
+
+class DamageTextPool:
+    """Active damage labels backed by an ObjectPool of expired ones.
+
+    At most `capacity` labels are alive at once; past that the oldest label is
+    recycled for the new hit (counted as a reuse).
+    """
+
+    def __init__(self, capacity=DAMAGE_TEXT_POOL_SIZE):
+        self.capacity = capacity
+        self.active = []
+        self.pool = ObjectPool(FloatingDamageText, capacity)
+
+    def spawn(self, text, pos, color=(255, 0, 0), lifetime=600, rise_speed=0.3):
+        if len(self.active) >= self.capacity:
+            label = self.active.pop(0)
+            label.reset(text, pos, color, lifetime, rise_speed)
+            self.pool.reused += 1
+        else:
+            label = self.pool.acquire(text, pos, color, lifetime, rise_speed)
+        self.active.append(label)
+        return label
+
+    def update(self, dt):
+        still_active = []
+        for label in self.active:
+            label.update(dt)
+            if label.is_expired():
+                self.pool.release(label)
+            else:
+                still_active.append(label)
+        self.active = still_active
+
+    def draw(self, screen):
+        return [label.draw(screen) for label in self.active]
+
+    def __len__(self):
+        return len(self.active)
 
+    def __iter__(self):
+        return iter(self.active)
@@ -1,16 +1,29 @@
 import pygame
+import game_clock
 import os
 from enemy_profiles import ENEMY_PROFILES
-from settings import SHOW_ENEMY_HP_BAR, SHOW_HITBOX_ENEMY
-from math import sqrt
+from settings import SHOW_ENEMY_HP_BAR, SHOW_HITBOX_ENEMY, SPEED_FRAME_MS
+from math import sqrt, hypot
 import random
+import numpy as np
 from exp_star import EXPStar
+from asset_cache import asset_cache
+from game_log import get_logger
 
 SPRITE_SIZE = 64
 ANIMATION_DELAY = 120
 
+log = get_logger("enemy")
+
 global_exp_stars = []
 
+# (sprite_folder, frame_config items, scale) -> animations dict, shared by every Enemy
+_animation_cache = {}
+
+# facing codes used by EnemySteering
+DIRECTIONS = ("up", "down", "left", "right")
+UP, DOWN, LEFT, RIGHT = range(4)
+
 
 class Enemy:
     def __init__(self, x, y, enemy_type, sprite_folder, collision_handler,
@@ -57,78 +70,37 @@ class Enemy:
 
         self.alive = True
         self.exp_given = False
+        self.alpha = 255
 
         self.hp_bar = EnemyHPBar(self)
 
     def load_animations(self, folder):
-        animations = {}
-        for anim_type, frame_count in self.frame_config.items():
-            animations[anim_type] = {d: [] for d in ["up", "down", "left", "right"]}
-            sheet = pygame.image.load(os.path.join(folder, f"{anim_type}.png")).convert_alpha()
-
-            for i in range(frame_count):
-                for j, direction in enumerate(["down", "left", "right", "up"]):
-                    sprite = sheet.subsurface((i * SPRITE_SIZE, j * SPRITE_SIZE, SPRITE_SIZE, SPRITE_SIZE))
-                    sprite = pygame.transform.scale(sprite, (SPRITE_SIZE * self.scale, SPRITE_SIZE * self.scale))
-                    animations[anim_type][direction].append(sprite)
-
+        key = (folder, tuple(self.frame_config.items()), self.scale)
+        animations = _animation_cache.get(key)
+        if animations is None:
+            animations = self.build_animations(folder)
+            _animation_cache[key] = animations
         return animations
 
-    def move_towards_player(self):
-        print(
-            f"[DEBUG] Attempting to move. Alive: {self.alive}, Hurt: {self.playing_hurt}, Death: {self.playing_death}")
-        if not self.alive or self.playing_death or self.playing_hurt:
-            return
-
-        if not self.player:
-            print("[DEBUG] Player reference is None.")
-            return
+    def build_animations(self, folder):
+        animations = {}
+        directions = ["down", "left", "right", "up"]
+        for anim_type, frame_count in self.frame_config.items():
+            sheet_path = os.path.join(folder, f"{anim_type}.png")
 
-        dx = self.player.rect.centerx - self.rect.centerx
-        dy = self.player.rect.centery - self.rect.centery
-        distance = sqrt(dx ** 2 + dy ** 2)
+            def build():
+                sheet = pygame.image.load(sheet_path).convert_alpha()
+                frames = []
+                for i in range(frame_count):
+                    for j in range(len(directions)):
+                        sprite = sheet.subsurface((i * SPRITE_SIZE, j * SPRITE_SIZE, SPRITE_SIZE, SPRITE_SIZE))
+                        frames.append(pygame.transform.scale(sprite, (SPRITE_SIZE * self.scale, SPRITE_SIZE * self.scale)))
+                return frames
 
-        print(
-            f"[DEBUG] Distance to player: {distance:.2f}, Attack range: {self.attack_range}, Cooldown: {pygame.time.get_ticks() - self.last_attack_time}")
+            frames = asset_cache.load_frames(sheet_path, ("enemy", frame_count, SPRITE_SIZE, self.scale), build)
+            animations[anim_type] = {d: frames[j::len(directions)] for j, d in enumerate(directions)}
 
-        if abs(dx) > abs(dy):
-            self.direction = "right" if dx > 0 else "left"
-        else:
-            self.direction = "down" if dy > 0 else "up"
-
-        # ✅ Enemy will keep moving if not in attack animation
-        #    And will fallback to reposition if too close
-        should_move = False
-        if distance > self.attack_range * 1.15 and not self.playing_attack:
-            should_move = True
-        elif distance < self.attack_range * 0.75 and not self.playing_attack:
-            # Fallback: too close, back away slightly
-            dx = -dx
-            dy = -dy
-            should_move = True
-
-        if should_move:
-            direction_x = dx / distance
-            direction_y = dy / distance
-
-            self.pos_x += direction_x * self.speed
-            self.pos_y += direction_y * self.speed
-
-            self.rect.x = int(self.pos_x)
-            self.rect.y = int(self.pos_y)
-
-            self.hitbox.topleft = (
-                self.rect.x + self.hitbox_offset[0],
-                self.rect.y + self.hitbox_offset[1]
-            )
-        else:
-            now = pygame.time.get_ticks()
-            if now - self.last_attack_time >= self.attack_cooldown and not self.playing_attack:
-                self.playing_attack = True
-                self.current_animation = "attack"
-                self.frame = 0
-                self.animation_timer = 0
-                self.last_attack_time = now
+        return animations
 
     def update_animation(self, dt):
         self.animation_timer += dt
@@ -137,8 +109,9 @@ class Enemy:
             frames = self.animations[self.current_animation][self.direction]
 
             self.frame += 1
-            print(
-                f"[DEBUG] Animation Frame Update | Animation: {self.current_animation}, Frame: {self.frame}/{len(frames)}")
+            if log.debug_on:
+                log.debug("Animation Frame Update | Animation: %s, Frame: %s/%s",
+                          self.current_animation, self.frame, len(frames))
 
             if self.frame >= len(frames):
                 self.frame = 0
@@ -146,12 +119,14 @@ class Enemy:
                 if self.current_animation == "hurt":
                     self.playing_hurt = False
                     self.current_animation = "walk"
-                    print("[DEBUG] Hurt animation ended. Returning to walk.")
+                    if log.debug_on:
+                        log.debug("Hurt animation ended. Returning to walk.")
 
                 elif self.current_animation == "death":
                     self.alive = False
                     self.image = None
-                    print("[DEBUG] Death animation ended. Enemy marked as dead.")
+                    if log.debug_on:
+                        log.debug("Death animation ended. Enemy marked as dead.")
                     if not self.exp_given:
                         self.spawn_exp(self.player)
                         self.exp_given = True
@@ -161,7 +136,8 @@ class Enemy:
                     self.playing_attack = False
                     self.current_animation = "walk"
                     self.has_damaged = False
-                    print("[DEBUG] Attack animation ended. Returning to walk.")
+                    if log.debug_on:
+                        log.debug("Attack animation ended. Returning to walk.")
 
             # ดาเมจเกิด frame สุดท้ายของ attack
             if self.current_animation == "attack" and self.frame == len(frames) - 1:
@@ -169,9 +145,11 @@ class Enemy:
                     dx = self.player.rect.centerx - self.rect.centerx
                     dy = self.player.rect.centery - self.rect.centery
                     distance = sqrt(dx ** 2 + dy ** 2)
-                    print(f"[DEBUG] Melee attack check: distance={distance}, range={self.attack_range}")
+                    if log.debug_on:
+                        log.debug("Melee attack check: distance=%s, range=%s", distance, self.attack_range)
                     if distance <= self.attack_range * 1.15:
-                        print("[HIT] Enemy attacked player")
+                        if log.debug_on:
+                            log.debug("Enemy attacked player")
                         self.player.take_damage(self.atk)
                     self.has_damaged = True
 
@@ -187,60 +165,177 @@ class Enemy:
             star = EXPStar(self.rect.centerx + offset_x, self.rect.centery + offset_y, self.exp // pieces, player)
             global_exp_stars.append(star)
 
-    def update(self, player_rect, dt, player):
-        if self.alive:
-
-            if not self.player:
-                self.player = player  # ✅ fallback สำรอง
-            print(f"[DEBUG] Enemy Update | Alive: {self.alive}, Animation: {self.current_animation}, Hurt: {self.playing_hurt}")
-            self.update_animation(dt)
-            self.move_towards_player()
-
     def take_damage(self, amount):
-        print(
-            f"[DEBUG] take_damage called | HP: {self.hp}, Playing Hurt: {self.playing_hurt}, Playing Death: {self.playing_death}")
+        if log.debug_on:
+            log.debug("take_damage called | HP: %s, Playing Hurt: %s, Playing Death: %s",
+                      self.hp, self.playing_hurt, self.playing_death)
 
         if self.playing_hurt or self.playing_death:
-            print("[DEBUG] Ignored damage due to current animation state.")
-            return
+            if log.debug_on:
+                log.debug("Ignored damage due to current animation state.")
+            return False
         self.hp -= amount
-        print(f"[DEBUG] Damage applied. New HP: {self.hp}")
+        if log.debug_on:
+            log.debug("Damage applied. New HP: %s", self.hp)
         if self.hp <= 0:
-            self.hitbox = pygame.Rect(0, 0, 0, 0)
             self.collision_handler.remove_dynamic(self.hitbox)
+            self.hitbox = pygame.Rect(0, 0, 0, 0)
             self.playing_death = True
             self.current_animation = "death"
             self.frame = 0
             self.animation_timer = 0
             self.image = self.animations["death"][self.direction][self.frame]
-            print("[DEBUG] Enemy is dying. Switching to death animation.")
+            if log.debug_on:
+                log.debug("Enemy is dying. Switching to death animation.")
         else:
             self.current_animation = "hurt"
             self.playing_hurt = True
-            self.hurt_start_time = pygame.time.get_ticks()
+            self.hurt_start_time = game_clock.get_ticks()
             self.frame = 0
             self.animation_timer = 0
             self.image = self.animations["hurt"][self.direction][self.frame]
-            print("[DEBUG] Enemy is hurt. Switching to hurt animation.")
+            if log.debug_on:
+                log.debug("Enemy is hurt. Switching to hurt animation.")
+        return True
 
     def is_dead(self):
         return not self.alive
 
-    def draw(self, screen):
+    def draw(self, screen, topleft=None):
+        """Draws at `topleft` (the interpolated position) if given, else at rect."""
         if (self.alive or self.current_animation == "death") and self.image:
-            screen.blit(self.image, self.rect)
+            rect = self.rect if topleft is None else self.rect.move(topleft[0] - self.rect.x,
+                                                                    topleft[1] - self.rect.y)
+            if self.alpha < 255:
+                # frames are shared between enemies, so fade a private copy
+                img = self.image.copy()
+                img.set_alpha(self.alpha)
+                area = screen.blit(img, rect)
+            else:
+                area = screen.blit(self.image, rect)
             if SHOW_HITBOX_ENEMY and self.alive:
-                pygame.draw.rect(screen, (255, 0, 0), self.hitbox, 2)
+                area.union_ip(pygame.draw.rect(screen, (255, 0, 0), self.hitbox, 2))
             if self.alive:
-                self.hp_bar.draw(screen)
-
-
+                bar_area = self.hp_bar.draw(screen, rect)
+                if bar_area:
+                    area.union_ip(bar_area)
+            return area
+        return None
+
+
+
+
+class EnemySteering:
+    """Moves every enemy in a room towards the player in one numpy step.
+
+    Speeds, attack ranges, cooldowns and positions live in numpy arrays indexed
+    like EnemyManager.enemies. step() works out facing, approach/retreat and
+    attack starts for all of them at once, then writes back only to the enemies
+    whose direction, position or attack state actually changed.
+    """
+
+    def __init__(self, enemies):
+        self.enemies = list(enemies)
+        self.speed = np.array([e.speed for e in enemies], dtype=float)
+        self.attack_range = np.array([e.attack_range for e in enemies], dtype=float)
+        self.attack_cooldown = np.array([e.attack_cooldown for e in enemies], dtype=float)
+        self.last_attack = np.array([e.last_attack_time for e in enemies], dtype=float)
+        self.pos = np.array([(e.pos_x, e.pos_y) for e in enemies], dtype=float).reshape(-1, 2)
+        self.topleft = np.array([e.rect.topleft for e in enemies], dtype=np.int64).reshape(-1, 2)
+        self.previous = self.topleft.copy()
+        self.half_size = np.array([(e.rect.width // 2, e.rect.height // 2) for e in enemies],
+                                  dtype=np.int64).reshape(-1, 2)
+        self.hitbox_offset = [tuple(e.hitbox_offset) for e in enemies]
+        self.facing = np.array([DIRECTIONS.index(e.direction) for e in enemies], dtype=np.int64)
+
+    def step(self, target, now, active, attacking, navigation=None, dt=SPEED_FRAME_MS):
+        """Steers every enemy towards `target` (the player's centre); returns the indices that moved.
+
+        active:     enemies allowed to act this tick (alive, not hurt or dying)
+        attacking:  enemies in the middle of an attack animation
+        navigation: the room's FlowField; enemies without a clear line to the
+                    player follow it instead of walking straight into walls
+        dt:         tick length in ms; speeds are per 60 FPS frame
+        """
+        center = self.topleft + self.half_size
+        dx = target[0] - center[:, 0]
+        dy = target[1] - center[:, 1]
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        face_x, face_y = dx, dy
+        follow = None
+        if navigation is not None:
+            flow_x, flow_y, direct = navigation.sample(center[:, 0], center[:, 1])
+            follow = ~direct & ((flow_x != 0) | (flow_y != 0))
+            if follow.any():
+                face_x = np.where(follow, flow_x, dx)
+                face_y = np.where(follow, flow_y, dy)
+            else:
+                follow = None
+
+        facing = np.where(np.abs(face_x) > np.abs(face_y),
+                          np.where(face_x > 0, RIGHT, LEFT),
+                          np.where(face_y > 0, DOWN, UP))
+        turned = np.flatnonzero(active & (facing != self.facing))
+        self.facing[turned] = facing[turned]
+
+        # ✅ เดินเข้าหาถ้าไกลเกิน ถอยออกถ้าใกล้เกิน ระหว่างนั้นคือระยะโจมตี
+        free = active & ~attacking
+        retreat = free & (distance < self.attack_range * 0.75)
+        moving = (free & (distance > self.attack_range * 1.15)) | retreat
+        moved = np.flatnonzero(moving)
+        if moved.size:
+            sign = np.where(retreat, -1.0, 1.0)
+            safe = np.where(distance > 0, distance, 1.0)
+            speed = self.speed * (dt / SPEED_FRAME_MS)
+            step_x = dx / safe * sign * speed
+            step_y = dy / safe * sign * speed
+            if follow is not None:
+                # backing away stays a straight line; only the approach follows the field
+                path = follow & ~retreat
+                step_x = np.where(path, flow_x * speed, step_x)
+                step_y = np.where(path, flow_y * speed, step_y)
+            self.pos[moved, 0] += step_x[moved]
+            self.pos[moved, 1] += step_y[moved]
+            self.topleft[moved] = np.trunc(self.pos[moved])
+
+        ready = free & ~moving & (now - self.last_attack >= self.attack_cooldown)
+        starts = np.flatnonzero(ready)
+        self.last_attack[starts] = now
+
+        enemies = self.enemies
+        for i in turned.tolist():
+            enemies[i].direction = DIRECTIONS[facing[i]]
+        for i, (x, y), (fx, fy) in zip(moved.tolist(), self.topleft[moved].tolist(), self.pos[moved].tolist()):
+            enemy = enemies[i]
+            enemy.pos_x, enemy.pos_y = fx, fy
+            enemy.rect.topleft = (x, y)
+            ox, oy = self.hitbox_offset[i]
+            enemy.hitbox.topleft = (x + ox, y + oy)
+        for i in starts.tolist():
+            enemy = enemies[i]
+            enemy.playing_attack = True
+            enemy.current_animation = "attack"
+            enemy.frame = 0
+            enemy.animation_timer = 0
+            enemy.last_attack_time = now
+        return moved
+
+    def interpolated(self, alpha):
+        """Draw positions part-way (alpha) from the start-of-tick positions to the current ones."""
+        return np.trunc(self.previous + (self.topleft - self.previous) * alpha).astype(np.int64)
 
 
 class EnemyManager:
-    def __init__(self, collision_handler):
+    def __init__(self, collision_handler, navigation=None):
         self.enemies = []
         self.collision_handler = collision_handler
+        self.navigation = navigation
+        self.steering = None
+        # id(hitbox) -> index in self.enemies, to turn collision grid hits back into enemies
+        self.hitbox_owners = {}
+        # how far outside its hitbox an enemy's sprite centre can be (enemies_in_radius pads by this)
+        self.center_reach = 0
 
     def create_enemy_from_profile(self, x, y, enemy_type, sprite_name):
         profile = ENEMY_PROFILES[sprite_name]
@@ -260,6 +355,8 @@ class EnemyManager:
         )
 
     def spawn_from_data(self, data_list, player=None):
+        for enemy in self.enemies:
+            self.collision_handler.remove_dynamic(enemy.hitbox)
         self.enemies.clear()
         for data in data_list:
             try:
@@ -267,22 +364,109 @@ class EnemyManager:
                 if player:
                     enemy.player = player
                 self.enemies.append(enemy)
-                print(f"[OK] Spawned enemy {data['type']} using {data['sprite']} at ({data['x']},{data['y']})")
+                self.collision_handler.add_dynamic([enemy.hitbox])
+                if log.debug_on:
+                    log.debug("Spawned enemy %s using %s at (%s,%s)", data["type"], data["sprite"], data["x"], data["y"])
             except Exception as e:
-                print(f"[ERROR] Failed to create enemy {data}: {e}")
+                log.error("Failed to create enemy %s: %s", data, e)
+        self.steering = EnemySteering(self.enemies)
+        self.hitbox_owners = {id(enemy.hitbox): i for i, enemy in enumerate(self.enemies)}
+        self.center_reach = max((self.hitbox_gap(enemy) for enemy in self.enemies), default=0)
+
+    @staticmethod
+    def hitbox_gap(enemy):
+        cx, cy = enemy.rect.center
+        box = enemy.hitbox
+        return max(0, box.left - cx, cx - box.right, box.top - cy, cy - box.bottom) + 1
+
+    def enemies_in_rect(self, rect):
+        """Enemies whose hitbox overlaps `rect`, in spawn order, looked up in the collision grid."""
+        owners = self.hitbox_owners
+        enemies = self.enemies
+        found = []
+        for hitbox in self.collision_handler.query_rect(rect):
+            i = owners.get(id(hitbox))
+            # dying enemies leave the grid, but check the id still belongs to their current hitbox
+            if i is not None and enemies[i].hitbox is hitbox:
+                found.append(i)
+        found.sort()
+        return [enemies[i] for i in found]
+
+    def enemies_in_radius(self, center, radius):
+        """Enemies whose sprite centre is closer than `radius` to `center`, in spawn order."""
+        cx, cy = center
+        reach = radius + self.center_reach
+        bounds = pygame.Rect(int(cx - reach) - 1, int(cy - reach) - 1, int(reach * 2) + 3, int(reach * 2) + 3)
+        return [enemy for enemy in self.enemies_in_rect(bounds)
+                if hypot(enemy.rect.centerx - cx, enemy.rect.centery - cy) < radius]
+
+    def sweep(self, segments):
+        """First living enemy each (x0, y0, x1, y1) segment runs into, as (enemy, t) or None.
+
+        t is how far along the segment (0..1) the hitbox is entered; equal t goes
+        to the enemy spawned first. One call resolves a whole tick of projectiles.
+        """
+        owners = self.hitbox_owners
+        enemies = self.enemies
+        query = self.collision_handler.query_segment
+        hits = []
+        for segment in segments:
+            best = None
+            for t, hitbox in query(*segment):
+                i = owners.get(id(hitbox))
+                if i is None or enemies[i].hitbox is not hitbox or enemies[i].is_dead():
+                    continue
+                if best is None or (t, i) < best:
+                    best = (t, i)
+            hits.append(None if best is None else (enemies[best[1]], best[0]))
+        return hits
 
     def set_alpha(self, alpha):
         for enemy in self.enemies:
-            if hasattr(enemy, "image"):
-                enemy.image.set_alpha(alpha)
+            enemy.alpha = alpha
 
     def update_all(self, player_rect, dt, player):
-        for enemy in self.enemies:
-            enemy.update(player_rect, dt, player)
+        """Animates each enemy, then steers the whole room in one EnemySteering step."""
+        enemies = self.enemies
+        if self.steering is None or self.steering.enemies != enemies:
+            self.steering = EnemySteering(enemies)
+
+        active = []
+        attacking = []
+        for enemy in enemies:
+            if enemy.alive:
+                if not enemy.player:
+                    enemy.player = player  # ✅ fallback สำรอง
+                enemy.update_animation(dt)
+            active.append(enemy.alive and not enemy.playing_death and not enemy.playing_hurt
+                          and enemy.player is not None)
+            attacking.append(enemy.playing_attack)
+        if not enemies:
+            return
+
+        navigation = self.navigation
+        if navigation is not None:
+            # one field per tick for the whole room; rebuilt only when the player changes cell
+            navigation.update(player_rect.center)
+        moved = self.steering.step(player_rect.center, game_clock.get_ticks(),
+                                   np.array(active), np.array(attacking), navigation, dt)
+        if log.debug_on:
+            log.debug("Steered %s enemies, %s active, %s moved", len(enemies), sum(active), len(moved))
+        # hitboxes move in place, so only the grid cells need refreshing
+        for i in moved.tolist():
+            self.collision_handler.update_dynamic(enemies[i].hitbox)
+
+    def remember_positions(self):
+        if self.steering is not None:
+            self.steering.previous[:] = self.steering.topleft
 
     def draw_all(self, screen, debug=False):
-        for enemy in self.enemies:
-            enemy.draw(screen)
+        enemies = self.enemies
+        steering = self.steering
+        if steering is None or steering.enemies != enemies:
+            return [enemy.draw(screen) for enemy in enemies]
+        positions = steering.interpolated(game_clock.interpolation()).tolist()
+        return [enemy.draw(screen, pos) for enemy, pos in zip(enemies, positions)]
 
     def all_defeated(self):
         return all(enemy.is_dead() for enemy in self.enemies)
@@ -298,12 +482,13 @@ class EnemyHPBar:
         self.bg_color = (60, 60, 60)
         self.hp_color = (200, 50, 50)
 
-    def draw(self, screen):
+    def draw(self, screen, rect=None):
         if not SHOW_ENEMY_HP_BAR or not self.enemy.alive:
             return
 
-        x = self.enemy.rect.centerx - self.width // 2
-        y = self.enemy.rect.top - self.offset_y
+        rect = rect or self.enemy.rect
+        x = rect.centerx - self.width // 2
+        y = rect.top - self.offset_y
 
         ratio = max(0, self.enemy.hp / self.enemy.max_hp)
         inner_width = int(self.width * ratio)
@@ -311,3 +496,4 @@ class EnemyHPBar:
         pygame.draw.rect(screen, self.bg_color, (x, y, self.width, self.height))
         pygame.draw.rect(screen, self.border_color, (x, y, self.width, self.height), 1)
         pygame.draw.rect(screen, self.hp_color, (x + 1, y + 1, inner_width - 2, self.height - 2))
+        return pygame.Rect(x, y, self.width, self.height)
@@ -1,39 +1,50 @@
 import pygame
 from math import sin, sqrt, pi
-import time
+import game_clock
+from glow_cache import glow_cache
+from settings import SPEED_FRAME_MS
 
 class EXPStar:
     def __init__(self, x, y, amount, player):
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
         self.amount = amount
         self.player = player
         self.radius = 6
         self.base_radius = 6
         self.color = (255, 230, 50)
         self.speed = 3
-        self.spawn_time = time.time()
+        self.spawn_time = game_clock.get_ticks()
 
-    def update(self):
+    def remember_position(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def update(self, dt):
         dx = self.player.rect.centerx - self.x
         dy = self.player.rect.centery - self.y
         dist = max(1, sqrt(dx ** 2 + dy ** 2))
-        self.x += self.speed * dx / dist
-        self.y += self.speed * dy / dist
+        step = self.speed * dt / SPEED_FRAME_MS
+        self.x += step * dx / dist
+        self.y += step * dy / dist
 
     def draw(self, screen):
-        pulse = 1 + 0.3 * sin((time.time() - self.spawn_time) * 6 * pi)  # pulsating effect
+        pulse = 1 + 0.3 * sin((game_clock.get_ticks() - self.spawn_time) / 1000 * 6 * pi)  # pulsating effect
         radius = int(self.base_radius * pulse)
+        x, y = game_clock.interpolate((self.prev_x, self.prev_y), (self.x, self.y))
 
         # Outer glow
         for glow_radius in range(radius + 6, radius, -2):
             alpha = max(20, 255 - (glow_radius - radius) * 30)
-            glow_surface = pygame.Surface((glow_radius*2, glow_radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*self.color, alpha), (glow_radius, glow_radius), glow_radius)
-            screen.blit(glow_surface, (self.x - glow_radius, self.y - glow_radius))
+            glow_surface = glow_cache.circle(glow_radius, self.color, alpha)
+            screen.blit(glow_surface, (x - glow_radius, y - glow_radius))
 
         # Core
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), radius)
+        pygame.draw.circle(screen, self.color, (int(x), int(y)), radius)
+        outer = radius + 7
+        return pygame.Rect(int(x) - outer, int(y) - outer, outer * 2, outer * 2)
 
     def check_collision(self):
         dist = sqrt((self.player.rect.centerx - self.x) ** 2 + (self.player.rect.centery - self.y) ** 2)
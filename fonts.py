@@ -0,0 +1,59 @@
+import pygame
+
+MUSIC_FONT = "assets/fonts/NotoMusic-Regular.ttf"
+CINZEL_FONT = "assets/fonts/Cinzel-Regular.ttf"
+
+# (path, size, bold, italic) for file fonts and (name, size, bold) for system fonts, loaded by preload()
+PRELOAD_FONTS = [
+    (MUSIC_FONT, 18, False, False),
+    (MUSIC_FONT, 36, False, False),
+    (MUSIC_FONT, 72, False, False),
+    (CINZEL_FONT, 20, False, False),
+    (CINZEL_FONT, 24, False, False),
+    (CINZEL_FONT, 30, False, False),
+    (CINZEL_FONT, 36, False, False),
+    (CINZEL_FONT, 40, False, False),
+    (CINZEL_FONT, 42, False, False),
+    (CINZEL_FONT, 64, False, False),
+    (CINZEL_FONT, 72, False, False),
+    (CINZEL_FONT, 80, False, False),
+]
+PRELOAD_SYSFONTS = [
+    (None, 24, False),
+    ("Arial", 20, False),
+    ("Arial", 28, False),
+    ("Arial", 28, True),
+    ("georgia", 18, True),
+    ("georgia", 20, True),
+    ("georgia", 22, True),
+    ("consolas", 16, False),
+]
+
+_fonts = {}
+
+
+def get_font(path, size, bold=False, italic=False):
+    key = ("file", path, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(path, size)
+        font.bold = bold
+        font.italic = italic
+        _fonts[key] = font
+    return font
+
+
+def get_sysfont(name, size, bold=False, italic=False):
+    key = ("sys", name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+        _fonts[key] = font
+    return font
+
+
+def preload():
+    for path, size, bold, italic in PRELOAD_FONTS:
+        get_font(path, size, bold, italic)
+    for name, size, bold in PRELOAD_SYSFONTS:
+        get_sysfont(name, size, bold)
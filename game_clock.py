@@ -0,0 +1,69 @@
+import pygame
+from settings import SIM_TICK_MS, MAX_TICKS_PER_FRAME
+
+# None means "follow pygame's wall clock"; a number is simulated milliseconds
+_sim_time = None
+# rendered time not yet simulated, and how far the last frame got into the next tick (0..1)
+_accumulator = 0.0
+_alpha = 0.0
+
+
+def get_ticks():
+    if _sim_time is None:
+        return pygame.time.get_ticks()
+    return int(_sim_time)
+
+
+def use_fixed_clock(start=0):
+    global _sim_time
+    _sim_time = float(start)
+    reset_accumulator()
+
+
+def use_real_clock():
+    global _sim_time
+    _sim_time = None
+
+
+def is_fixed():
+    return _sim_time is not None
+
+
+def advance(dt):
+    global _sim_time
+    if _sim_time is not None:
+        _sim_time += dt
+
+
+def accumulate(frame_ms):
+    """Banks one rendered frame's duration; returns how many SIM_TICK_MS ticks to simulate now.
+
+    Past MAX_TICKS_PER_FRAME the rest is dropped, so a long hitch slows the game
+    down for a moment instead of making every following frame run more ticks.
+    """
+    global _accumulator, _alpha
+    _accumulator += frame_ms
+    ticks = int(_accumulator // SIM_TICK_MS)
+    if ticks > MAX_TICKS_PER_FRAME:
+        ticks = MAX_TICKS_PER_FRAME
+        _accumulator = 0.0
+    else:
+        _accumulator -= ticks * SIM_TICK_MS
+    _alpha = _accumulator / SIM_TICK_MS
+    return ticks
+
+
+def reset_accumulator():
+    global _accumulator, _alpha
+    _accumulator = 0.0
+    _alpha = 0.0
+
+
+def interpolation():
+    return _alpha
+
+
+def interpolate(previous, current):
+    """Draw position of something that moved from `previous` to `current` during the last tick."""
+    return (previous[0] + (current[0] - previous[0]) * _alpha,
+            previous[1] + (current[1] - previous[1]) * _alpha)
@@ -0,0 +1,106 @@
+import sys
+import time
+from collections import deque
+from settings import LOG_LEVEL, LOG_LEVELS, LOG_BUFFER_SIZE, LOG_TO_CONSOLE
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERROR", OFF: "OFF"}
+LEVEL_VALUES = {name: value for value, name in LEVEL_NAMES.items()}
+
+# Records are stored unformatted; the message is only built when printed or dumped
+ring_buffer = deque(maxlen=LOG_BUFFER_SIZE)
+_loggers = {}
+
+
+def _to_level(level):
+    return LEVEL_VALUES[level.upper()] if isinstance(level, str) else level
+
+
+class Logger:
+    """Per-module logger.
+
+    Hot paths should check the cached flag before calling, e.g.
+    ``if log.debug_on: log.debug("hp=%s", hp)``, so nothing is evaluated when the
+    level is off. Arguments are %-formatted lazily.
+    """
+
+    def __init__(self, name, level):
+        self.name = name
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = _to_level(level)
+        self.debug_on = self.level <= DEBUG
+        self.info_on = self.level <= INFO
+        self.warn_on = self.level <= WARN
+        self.error_on = self.level <= ERROR
+
+    def log(self, level, msg, *args):
+        if level < self.level:
+            return
+        record = (time.time(), level, self.name, msg, args)
+        ring_buffer.append(record)
+        if LOG_TO_CONSOLE:
+            print(format_record(record))
+
+    def debug(self, msg, *args):
+        if self.debug_on:
+            self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        if self.info_on:
+            self.log(INFO, msg, *args)
+
+    def warn(self, msg, *args):
+        if self.warn_on:
+            self.log(WARN, msg, *args)
+
+    def error(self, msg, *args):
+        if self.error_on:
+            self.log(ERROR, msg, *args)
+
+
+def format_record(record):
+    _, level, name, msg, args = record
+    if args:
+        try:
+            msg = msg % args
+        except (TypeError, ValueError):
+            msg = f"{msg} {args}"
+    return f"[{LEVEL_NAMES.get(level, level)}] {name}: {msg}"
+
+
+def get_logger(name):
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name, LOG_LEVELS.get(name, LOG_LEVEL))
+    return logger
+
+
+def set_level(name, level):
+    get_logger(name).set_level(level)
+
+
+def dump(path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in ring_buffer:
+            stamp = time.strftime("%H:%M:%S", time.localtime(record[0]))
+            f.write(f"{stamp} {format_record(record)}\n")
+
+
+def install_crash_dump(path):
+    previous_hook = sys.excepthook
+
+    def hook(exc_type, exc, tb):
+        try:
+            dump(path)
+            print(f"[ERROR] log: last {len(ring_buffer)} log records written to {path}", file=sys.stderr)
+        finally:
+            previous_hook(exc_type, exc, tb)
+
+    sys.excepthook = hook
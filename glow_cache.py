@@ -0,0 +1,35 @@
+import pygame
+from settings import GLOW_CACHE_MAX_BYTES, GLOW_ALPHA_STEP
+from text_cache import SurfaceCache
+
+
+def quantize_alpha(alpha, step=GLOW_ALPHA_STEP):
+    alpha = int(round(alpha / step)) * step
+    return 0 if alpha < 0 else 255 if alpha > 255 else alpha
+
+
+class GlowCache(SurfaceCache):
+    """Pre-rendered glow circles keyed by (radius, color, quantized alpha).
+
+    Replaces the "new SRCALPHA surface + draw.circle" done every frame by the
+    glow effects; the caller keeps its own blit position and blend flags.
+    """
+
+    def __init__(self, max_bytes=GLOW_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def circle(self, radius, color, alpha=255, canvas=None):
+        """Filled circle of `radius` centred on a (canvas x canvas) surface, 2*radius wide by default."""
+        radius = max(0, int(radius))
+        alpha = quantize_alpha(alpha)
+        size = radius * 2 if canvas is None else canvas
+        key = (radius, color[:3], alpha, size)
+        surface = self._get(key)
+        if surface is None:
+            surface = pygame.Surface((size, size), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (*color[:3], alpha), (size // 2, size // 2), radius)
+            surface = self._put(key, surface)
+        return surface
+
+
+glow_cache = GlowCache()
@@ -0,0 +1,194 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import random
+import time
+import pygame
+import game_clock
+import fonts
+from skill_effect import preload_skill_frames
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
+
+FIXED_DT = 1000 / FPS
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed(): keys[K_x] is True while K_x is held."""
+
+    def __init__(self):
+        self.held = set()
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    """Plays back a list of (frames, keys) segments, holding `keys` for `frames` frames.
+
+    KEYDOWN / KEYUP events are generated whenever the held set changes. Once the
+    script runs out every key is released.
+    """
+
+    def __init__(self, script=None):
+        self.script = list(script or [])
+        self.segment = 0
+        self.frames_left = self.script[0][0] if self.script else 0
+        self.keys = ScriptedKeys()
+        self.events = []
+
+    def advance(self, dt=None):
+        while self.segment < len(self.script) and self.frames_left <= 0:
+            self.segment += 1
+            if self.segment < len(self.script):
+                self.frames_left = self.script[self.segment][0]
+
+        if self.segment < len(self.script):
+            held = set(self.script[self.segment][1])
+            self.frames_left -= 1
+        else:
+            held = set()
+
+        previous = self.keys.held
+        self.events = [pygame.event.Event(pygame.KEYUP, key=k) for k in previous - held]
+        self.events += [pygame.event.Event(pygame.KEYDOWN, key=k) for k in held - previous]
+        self.keys.held = held
+        return dt
+
+
+def parse_script(text):
+    """'right:60,d+right:1,:30' -> [(60, [K_RIGHT]), (1, [K_d, K_RIGHT]), (30, [])]"""
+    script = []
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        names, _, frames = part.rpartition(":")
+        keys = [pygame.key.key_code(name) for name in names.split("+") if name]
+        script.append((int(frames), keys))
+    return script
+
+
+def init_headless():
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    fonts.preload()
+    preload_skill_frames()
+    return screen
+
+
+def game_state(scene):
+    """What a replay has to reproduce every frame: simulated time, player and enemies."""
+    player = scene.player
+    return (game_clock.get_ticks(), player.rect.topleft, player.hp, player.exp,
+            tuple((e.rect.topleft, e.hp, e.current_animation) for e in scene.enemy_manager.enemies))
+
+
+def run_headless(frames, script=None, map_name="tutorial_hall", dt=FIXED_DT, render=True, seed=None,
+                 input_source=None, trace=None):
+    """Runs GameScene for `frames` frames; input_source (e.g. a ReplayInput) replaces the script.
+
+    Replay and recording inputs seed `random` and set up the game clock themselves.
+    A scripted `escape` pauses and resumes right away, as if Resume were picked.
+    If `trace` is a list, game_state() is appended to it after every frame.
+    """
+    from scene_manager import SceneManager
+    from scenes.game_scene import GameScene
+    from scenes.pause_scene import PauseScene
+
+    screen = pygame.display.get_surface() or init_headless()
+    if input_source is None:
+        if seed is not None:
+            random.seed(seed)
+        game_clock.use_fixed_clock()
+        input_source = ScriptedInput(script)
+
+    scene = GameScene(screen, map_name=map_name, headless=True, fixed_dt=dt,
+                      input_source=input_source)
+    manager = SceneManager(scene)
+    scene.on_enter()
+
+    start = time.perf_counter()
+    sim_start = game_clock.get_ticks()
+    simulated = 0
+    for _ in range(frames):
+        scene.update()
+        if isinstance(manager.scene, PauseScene) and manager.scene.game_scene is scene:
+            manager.switch_to(scene)
+        if manager.scene is not scene or not scene.running:
+            break
+        if trace is not None:
+            trace.append(game_state(scene))
+        if render:
+            scene.draw()
+        simulated += 1
+    elapsed = time.perf_counter() - start
+    sim_ms = game_clock.get_ticks() - sim_start
+
+    game_clock.use_real_clock()
+    return {
+        "frames": simulated,
+        "sim_ms": sim_ms,
+        "wall_s": elapsed,
+        "fps": simulated / elapsed if elapsed > 0 else float("inf"),
+        "scene": scene,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run GameScene without a display at a fixed timestep.")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--map", default="tutorial_hall")
+    parser.add_argument("--dt", type=float, default=FIXED_DT,
+                        help="milliseconds per rendered frame; the simulation always ticks every SIM_TICK_MS")
+    parser.add_argument("--script", default="", help="e.g. 'right:60,d+right:1,:30'")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-render", action="store_true", help="skip GameScene.draw entirely")
+    parser.add_argument("--profile-csv", default="", help="write per-stage frame timings to this CSV")
+    parser.add_argument("--replay", default="", help="play back a session log (sets the map and frame count)")
+    parser.add_argument("--record", default="", help="write the scripted run to a session log")
+    parser.add_argument("--verify", action="store_true",
+                        help="with --record, replay the log afterwards and check it reproduces the run")
+    args = parser.parse_args()
+
+    init_headless()
+    from replay import ReplayInput, RecordingInput
+    script = parse_script(args.script)
+    frames, map_name, input_source = args.frames, args.map, None
+    if args.replay:
+        input_source = ReplayInput(args.replay)
+        frames, map_name = len(input_source), input_source.map_name
+    elif args.record:
+        input_source = RecordingInput(args.record, map_name, source=ScriptedInput(script), seed=args.seed)
+
+    trace = [] if args.record and args.verify else None
+    stats = run_headless(frames, script, map_name, args.dt,
+                         render=not args.no_render, seed=args.seed, input_source=input_source, trace=trace)
+    print(f"[HEADLESS] {stats['frames']} frames ({stats['sim_ms'] / 1000:.1f}s simulated) "
+          f"in {stats['wall_s']:.2f}s -> {stats['fps']:.0f} fps")
+    if args.replay and stats["frames"] < frames:
+        print(f"[HEADLESS] replay left GameScene after {stats['frames']} of {frames} frames")
+    if args.record:
+        input_source.close()
+    if trace is not None:
+        from enemy import global_exp_stars
+        global_exp_stars.clear()  # drops left lying around by the recorded run
+        replayed = []
+        replay = ReplayInput(args.record)
+        run_headless(len(replay), map_name=map_name, dt=args.dt, render=not args.no_render,
+                     input_source=replay, trace=replayed)
+        diverged = next((i for i, (a, b) in enumerate(zip(trace, replayed)) if a != b), None)
+        if diverged is None and len(trace) == len(replayed):
+            print(f"[HEADLESS] replay of {args.record} matches all {len(trace)} frames")
+        else:
+            frame = diverged if diverged is not None else min(len(trace), len(replayed))
+            print(f"[HEADLESS] replay of {args.record} diverges at frame {frame}")
+            sys.exit(1)
+    if args.profile_csv:
+        from profiler import frame_profiler
+        frame_profiler.dump_csv(args.profile_csv)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
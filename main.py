@@ -2,16 +2,36 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import argparse
 import pygame
 from scene_manager import SceneManager
 from scenes.menu_scene import MenuScene
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, PROFILER_CSV, LOG_CRASH_FILE
+from profiler import frame_profiler
+import game_log
+import fonts
+from skill_effect import preload_skill_frames
+import replay
+
+log = game_log.get_logger("main")
 
 def main():
+    parser = argparse.ArgumentParser(description="Symphony of the Lost")
+    parser.add_argument("--record", default="", help="log the first game session for `headless.py --replay`")
+    args = parser.parse_args()
+
+    game_log.install_crash_dump(LOG_CRASH_FILE)
+    if args.record:
+        replay.record_to(args.record)
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    fonts.preload()
+    preload_skill_frames()
     manager = SceneManager(MenuScene(screen))
     manager.run()
+    replay.finish_recording()
+    if PROFILER_CSV and frame_profiler.dump_csv(PROFILER_CSV):
+        log.info("Frame timings written to %s", PROFILER_CSV)
     pygame.quit()
 
 if __name__ == "__main__":
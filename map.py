@@ -4,9 +4,12 @@ from map_profiles import MAP_PROFILES
 from npc_profile import NPC_PROFILES
 from npc import NPC
 from enemy import EnemyManager
+from map_prefetch import map_prefetcher, cached_background, scale_background
+from settings import PREFETCH_WAIT_MS
+from navigation import FlowField
 
 class Map:
-    def __init__(self, name: str, screen_size: tuple, map_dir="assets/background"):
+    def __init__(self, name: str, screen_size: tuple, map_dir="assets/background", load=True):
         self.name = name
         self.screen_width, self.screen_height = screen_size
         self.map_dir = map_dir
@@ -20,12 +23,38 @@ class Map:
         self.enemy_data = []
         self.enemy_manager = EnemyManager(None)
         self.scaled_image = None
-        self.load()
+        self.navigation = None
+        self.cutscene_mode = False
+        if load:
+            self.load()
 
     def load(self):
-        image_path = os.path.join(self.map_dir, f"{self.name}.png")
-        self.image = pygame.image.load(image_path).convert()
-        self.scaled_image = pygame.transform.scale(self.image, (self.screen_width, self.screen_height))
+        for _ in self.load_steps():
+            pass
+
+    def load_steps(self):
+        """Loads the map in stages, yielding after each one so a transition can spread it over frames."""
+        size = (self.screen_width, self.screen_height)
+        shared = self.map_dir == map_prefetcher.map_dir
+        scaled = None
+        if shared:
+            # a prefetch already decoding this map gets a few ms each frame to finish, so it isn't
+            # raced with a second decode and the fade keeps running while it's waited for
+            while map_prefetcher.in_flight(self.name, size, timeout=PREFETCH_WAIT_MS / 1000):
+                yield
+            scaled = map_prefetcher.get(self.name, size)
+        if scaled is None:
+            image_path = os.path.join(self.map_dir, f"{self.name}.png")
+            scaled = cached_background(image_path, size)
+            if scaled is None:
+                image = pygame.image.load(image_path)
+                yield
+                scaled = scale_background(image_path, image, size)
+            scaled = scaled.convert()
+            if shared:
+                map_prefetcher.put(self.name, size, scaled)
+        self.scaled_image = scaled
+        yield
 
         profile = MAP_PROFILES.get(self.name, {})
         self.collision_rects = [pygame.Rect(*r) for r in profile.get("collision_rects", [])]
@@ -46,6 +75,7 @@ class Map:
         if profile.get("barriers", False) and not self.cleared:
             self.barrier_rects.append(pygame.Rect(0, 540, 50, 540))
             self.barrier_rects.append(pygame.Rect(1870, 540, 50, 540))
+        self.navigation = FlowField(self.get_collision_rects(), size)
 
         if profile.get("has_npc", False) and profile.get("has_enemies", False):
             self.cutscene_mode = True
@@ -57,8 +87,12 @@ class Map:
 
         npc_names = profile.get("npcs", [])
         all_npc_data = NPC_PROFILES.get(self.name, [])
-        self.npc_list = [
-            NPC(
+        self.npc_list = []
+        for n in all_npc_data:
+            if n["name"] not in npc_names:
+                continue
+            yield
+            self.npc_list.append(NPC(
                 n["name"],
                 n["x"],
                 n["y"],
@@ -66,10 +100,7 @@ class Map:
                 n["dialog"],
                 n.get("scale", 1),
                 tuple(n.get("frame_size", (32, 32)))  # 👈 default to 48x48
-            )
-            for n in all_npc_data
-            if n["name"] in npc_names
-        ]
+            ))
 
     def draw(self, screen):
         screen.blit(self.scaled_image, (0, 0))
@@ -98,25 +129,13 @@ class Map:
             npc.update(dt)
 
     def draw_npcs(self, screen):
-        for npc in self.npc_list:
-            npc.draw(screen)
-
-    @staticmethod
-    def fade(screen, color=(0, 0, 0), speed=10):
-        fade = pygame.Surface(screen.get_size())
-        fade.fill(color)
-        for alpha in range(0, 255, speed):
-            fade.set_alpha(alpha)
-            screen.blit(fade, (0, 0))
-            pygame.display.update()
-            pygame.time.delay(5)
-
-    def transition_to(self, screen, new_map_name, screen_size):
-        Map.fade(screen)
-        new_map = Map(new_map_name, screen_size, self.map_dir)
-        Map.fade(screen, speed=-10)
-        return new_map
+        return [npc.draw(screen) for npc in self.npc_list]
 
     def mark_cleared(self):
+        """Opens the barriers; returns the rects that were removed so collisions can drop them too."""
         self.cleared = True
-        self.barrier_rects.clear()
\ No newline at end of file
+        opened = list(self.barrier_rects)
+        self.barrier_rects.clear()
+        if opened and self.navigation is not None:
+            self.navigation.set_obstacles(self.collision_rects)
+        return opened
\ No newline at end of file
@@ -0,0 +1,129 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+import pygame
+from map_profiles import MAP_PROFILES
+from asset_cache import asset_cache
+from game_log import get_logger
+from settings import MAP_CACHE_SIZE
+
+log = get_logger("map_prefetch")
+
+
+def cached_background(path, size):
+    """Background already scaled to `size` from the on-disk asset cache, or None."""
+    frames = asset_cache.read(path, ("background", tuple(size)))
+    return frames[0] if frames is not None else None
+
+
+def scale_background(path, image, size):
+    """Scales a freshly loaded background and stores it in the asset cache."""
+    surface = pygame.transform.scale(image, size)
+    asset_cache.write(path, ("background", tuple(size)), [surface], alpha=False)
+    return surface
+
+
+def decode_background(path, size):
+    """Background scaled to `size` as a plain surface (no display needed), via the on-disk asset cache."""
+    surface = cached_background(path, size)
+    if surface is None:
+        surface = scale_background(path, pygame.image.load(path), size)
+    return surface
+
+
+class MapPrefetcher:
+    """Decodes and pre-scales room backgrounds ahead of time on a worker thread.
+
+    The worker only decodes and scales (or reads the raw asset cache), which
+    doesn't need the display. poll() runs on the main thread, converts finished images to the
+    display format and stores them in a small LRU keyed by (map name, size).
+    Map.load_steps() then takes the background from here instead of decoding it.
+    """
+
+    def __init__(self, map_dir="assets/background", capacity=MAP_CACHE_SIZE):
+        self.map_dir = map_dir
+        self.capacity = capacity
+        self.ready = OrderedDict()  # (name, size) -> converted, scaled background
+        self.pending = set()
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.worker = None
+        self.hits = 0
+        self.misses = 0
+
+    def _work(self):
+        while True:
+            key = self.requests.get()
+            if key is None:
+                return
+            name, size = key
+            try:
+                self.results.put((key, decode_background(os.path.join(self.map_dir, f"{name}.png"), size)))
+            # always answer, since Map.load_steps may be waiting for this key
+            except Exception as e:
+                log.warn("Could not prefetch %s: %s", name, e)
+                self.results.put((key, None))
+
+    def request(self, name, size):
+        key = (name, tuple(size))
+        if key in self.ready or key in self.pending:
+            return
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._work, name="map-prefetch", daemon=True)
+            self.worker.start()
+        self.pending.add(key)
+        self.requests.put(key)
+
+    def prefetch_neighbours(self, map_name, size):
+        for data in MAP_PROFILES.get(map_name, {}).get("transitions", {}).values():
+            self.request(data["target_map"], size)
+
+    def poll(self, limit=1):
+        """Moves up to `limit` finished images into the cache. Main thread only (convert needs the display)."""
+        while limit and not self.results.empty():
+            self._store(*self.results.get_nowait())
+            limit -= 1
+
+    def _store(self, key, surface):
+        self.pending.discard(key)
+        if surface is not None:
+            self.put(key[0], key[1], surface.convert())
+            if log.debug_on:
+                log.debug("Prefetched %s", key[0])
+
+    def in_flight(self, name, size, timeout=0.0):
+        """True while the worker is still decoding this map, after waiting up to `timeout` seconds for it."""
+        self.poll(limit=len(self.pending))
+        key = (name, tuple(size))
+        if key in self.pending:
+            try:
+                self._store(*self.results.get(timeout=timeout))
+            except queue.Empty:
+                pass
+        return key in self.pending
+
+    def get(self, name, size):
+        """Cached background or None."""
+        self.poll(limit=len(self.pending))
+        key = (name, tuple(size))
+        surface = self.ready.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.ready.move_to_end(key)
+        return surface
+
+    def put(self, name, size, surface):
+        key = (name, tuple(size))
+        self.ready[key] = surface
+        self.ready.move_to_end(key)
+        while len(self.ready) > self.capacity:
+            self.ready.popitem(last=False)
+
+    def clear(self):
+        self.ready.clear()
+
+
+map_prefetcher = MapPrefetcher()
@@ -0,0 +1,87 @@
+import time
+import pygame
+import game_clock
+from map import Map
+from game_log import get_logger
+from settings import TRANSITION_FADE_OUT_MS, TRANSITION_FADE_IN_MS, TRANSITION_TTI_BUDGET_MS
+
+log = get_logger("transition")
+
+FADE_OUT = "fade_out"
+FADE_IN = "fade_in"
+DONE = "done"
+
+
+class MapTransition:
+    """Room change stepped once per frame by GameScene.
+
+    fade_out: the screen darkens while the next map loads one stage per frame.
+              Gameplay is frozen, but events are still handled.
+    fade_in:  the new map is swapped in and the player is back in control
+              while the overlay clears.
+    done:     the scene drops the transition.
+
+    tti_ms is the wall-clock time from crossing the zone to the swap, i.e. time-to-interactive.
+    """
+
+    def __init__(self, target, screen_size, fade_out_ms=TRANSITION_FADE_OUT_MS, fade_in_ms=TRANSITION_FADE_IN_MS):
+        self.target_map = target["target_map"]
+        self.player_pos = target["player_pos"]
+        self.fade_out_ms = fade_out_ms
+        self.fade_in_ms = fade_in_ms
+        self.state = FADE_OUT
+        self.state_start = game_clock.get_ticks()
+        self.wall_start = time.perf_counter()
+        self.alpha = 0
+        self.tti_ms = None
+
+        self.new_map = Map(self.target_map, screen_size, load=False)
+        self.loader = self.new_map.load_steps()
+        self.loaded = False
+        self.overlay = pygame.Surface(screen_size)
+        self.overlay.fill((0, 0, 0))
+
+    @property
+    def blocking(self):
+        return self.state == FADE_OUT
+
+    def step_loader(self, finish=False):
+        if self.loaded:
+            return
+        for _ in self.loader:
+            if not finish:
+                return
+        self.loaded = True
+
+    def update(self):
+        """Advances one frame. Returns the loaded Map on the frame it should be swapped in."""
+        now = game_clock.get_ticks()
+        elapsed = now - self.state_start
+
+        if self.state == FADE_OUT:
+            self.alpha = min(255, int(255 * elapsed / self.fade_out_ms)) if self.fade_out_ms else 255
+            if elapsed < self.fade_out_ms:
+                self.step_loader()
+                return None
+            # whatever is left to load happens now, behind a fully black screen
+            self.step_loader(finish=True)
+            self.state = FADE_IN
+            self.state_start = now
+            self.tti_ms = (time.perf_counter() - self.wall_start) * 1000
+            if self.tti_ms > TRANSITION_TTI_BUDGET_MS and log.warn_on:
+                log.warn("Transition to %s took %.0f ms to become interactive", self.target_map, self.tti_ms)
+            elif log.debug_on:
+                log.debug("Transition to %s interactive after %.1f ms", self.target_map, self.tti_ms)
+            return self.new_map
+
+        if self.state == FADE_IN:
+            self.alpha = max(0, 255 - int(255 * elapsed / self.fade_in_ms)) if self.fade_in_ms else 0
+            if elapsed >= self.fade_in_ms:
+                self.state = DONE
+        return None
+
+    def draw(self, screen):
+        if self.alpha <= 0:
+            return None
+        self.overlay.set_alpha(self.alpha)
+        return screen.blit(self.overlay, (0, 0))
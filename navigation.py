@@ -0,0 +1,161 @@
+from collections import deque
+import numpy as np
+from settings import NAV_CELL_SIZE
+from game_log import get_logger
+
+log = get_logger("navigation")
+
+UNREACHED = np.iinfo(np.int32).max
+# neighbour offsets (dx, dy): orthogonal first so ties prefer straight moves
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+class FlowField:
+    """Navigation grid for one map plus a flow field toward a single goal (the player).
+
+    The map's collision rects are rasterised into cells of `cell_size` px. For the
+    goal cell a breadth-first search gives every reachable cell its step
+    distance; each cell then points at its lowest-distance neighbour, without
+    cutting wall corners. Cells with a clear straight line to the goal count as
+    `direct`, so enemies in open ground keep walking straight at the player;
+    that check only runs for cells an enemy actually samples.
+
+    The field is shared by every enemy in the room and only rebuilt when the
+    goal changes cell or set_obstacles() is called (barriers opening).
+    """
+
+    def __init__(self, collision_rects, size, cell_size=NAV_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cols = -(-size[0] // cell_size)
+        self.rows = -(-size[1] // cell_size)
+        self.goal = None
+        self.recomputes = 0
+        self.set_obstacles(collision_rects)
+
+    def set_obstacles(self, collision_rects):
+        """Re-rasterises the blocked cells; the field is rebuilt on the next update()."""
+        size = self.cell_size
+        blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        for rect in collision_rects:
+            x0, y0 = max(rect.left // size, 0), max(rect.top // size, 0)
+            x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+            blocked[y0:y1 + 1, x0:x1 + 1] = True
+        self.blocked = blocked
+        self.goal = None
+
+        # 4-way neighbours of every free cell, as flat indices, for the BFS
+        cols = self.cols
+        free = (~blocked).ravel().tolist()
+        self.neighbours = neighbours = []
+        for index, is_free in enumerate(free):
+            y, x = divmod(index, cols)
+            candidates = []
+            if x > 0:
+                candidates.append(index - 1)
+            if x < cols - 1:
+                candidates.append(index + 1)
+            if y > 0:
+                candidates.append(index - cols)
+            if y < self.rows - 1:
+                candidates.append(index + cols)
+            neighbours.append([n for n in candidates if free[n]])
+
+    def cell_of(self, x, y):
+        size = self.cell_size
+        return (min(max(int(x) // size, 0), self.cols - 1),
+                min(max(int(y) // size, 0), self.rows - 1))
+
+    def update(self, target):
+        """Points the field at `target` (pixels); cheap unless the target moved to another cell."""
+        goal = self.cell_of(*target)
+        if goal != self.goal:
+            self._compute(goal)
+
+    def _compute(self, goal):
+        self.goal = goal
+        self.recomputes += 1
+        rows, cols = self.rows, self.cols
+        free = ~self.blocked
+        gx, gy = goal
+
+        # 🌊 BFS จากช่องของผู้เล่น (4 ทิศ) only visits reachable cells, so it stays cheap in corridors
+        flat = [UNREACHED] * (rows * cols)
+        start = gy * cols + gx
+        flat[start] = 0
+        queue = deque([start])
+        neighbours = self.neighbours
+        while queue:
+            index = queue.popleft()
+            step = flat[index] + 1
+            for n in neighbours[index]:
+                if flat[n] == UNREACHED:
+                    flat[n] = step
+                    queue.append(n)
+        distance = np.array(flat, dtype=np.int32).reshape(rows, cols)
+
+        # each cell points at its lowest-distance neighbour; diagonals need both sides open
+        padded = np.pad(distance, 1, constant_values=UNREACHED)
+        padded_free = np.pad(free, 1, constant_values=False)
+        best = distance.copy()
+        flow_x = np.zeros((rows, cols))
+        flow_y = np.zeros((rows, cols))
+        for dx, dy in STEPS:
+            neighbour = padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+            if dx and dy:
+                open_x = padded_free[1:1 + rows, 1 + dx:1 + dx + cols]
+                open_y = padded_free[1 + dy:1 + dy + rows, 1:1 + cols]
+                neighbour = np.where(open_x & open_y, neighbour, UNREACHED)
+            better = neighbour < best
+            best[better] = neighbour[better]
+            norm = 1 / np.hypot(dx, dy)
+            flow_x[better] = dx * norm
+            flow_y[better] = dy * norm
+        self.distance = distance
+        self.flow_x = flow_x
+        self.flow_y = flow_y
+        self.direct = np.zeros((rows, cols), dtype=bool)
+        self.direct_known = np.zeros((rows, cols), dtype=bool)
+
+        if log.debug_on:
+            log.debug("Flow field -> %s: %s reachable cells", goal, int((distance != UNREACHED).sum()))
+
+    def _line_of_sight(self, xs, ys):
+        """Whether cells (xs, ys) see the goal cell without crossing a blocked cell.
+
+        The line is sampled every half cell and each sample checks the cells on
+        both sides of it, since an enemy can sit anywhere in its cell and would
+        otherwise clip wall corners that the cell-centre line just misses.
+        """
+        gx, gy = self.goal
+        samples = 2 * max(self.rows, self.cols)
+        t = np.linspace(0, 1, samples + 2)[1:-1, None]
+        px = xs + (gx - xs) * t
+        py = ys + (gy - ys) * t
+        blocked = self.blocked
+        hit = blocked[ys, xs]
+        for cx in (np.floor(px).astype(np.int64), np.ceil(px).astype(np.int64)):
+            for cy in (np.floor(py).astype(np.int64), np.ceil(py).astype(np.int64)):
+                hit = hit | blocked[cy, cx].any(axis=0)
+        return ~hit
+
+    def sample(self, xs, ys):
+        """Flow direction and line-of-sight flag at the given pixel positions (arrays).
+
+        Positions off the grid, at the goal, or with no reachable neighbour get a zero vector.
+        """
+        size = self.cell_size
+        cx = xs // size
+        cy = ys // size
+        inside = (cx >= 0) & (cx < self.cols) & (cy >= 0) & (cy < self.rows)
+        cx = np.where(inside, cx, 0)
+        cy = np.where(inside, cy, 0)
+        flow_x = np.where(inside, self.flow_x[cy, cx], 0.0)
+        flow_y = np.where(inside, self.flow_y[cy, cx], 0.0)
+        unknown = ~self.direct_known[cy, cx]
+        if unknown.any():
+            cells = np.unique(cy[unknown] * self.cols + cx[unknown])
+            ys, xs = np.divmod(cells, self.cols)
+            self.direct[ys, xs] = self._line_of_sight(xs, ys)
+            self.direct_known[ys, xs] = True
+        direct = inside & self.direct[cy, cx]
+        return flow_x, flow_y, direct
@@ -1,5 +1,8 @@
 import pygame
+from fonts import get_sysfont
 import os
+from text_cache import text_cache
+from asset_cache import asset_cache
 
 class NPC:
     def __init__(self, name, x, y, sprite_folder, dialog, scale=1, frame_size=(48, 48)):
@@ -28,7 +31,7 @@ class NPC:
 
         # Dialog box
         self.dialog_box_surface = pygame.Surface((1800, 150), pygame.SRCALPHA)
-        self.dialog_font = pygame.font.SysFont("Arial", 28)
+        self.dialog_font = get_sysfont("Arial", 28)
 
         # Fade out
         self.alpha = 255
@@ -38,6 +41,10 @@ class NPC:
 
     def load_idle_frames(self):
         path = os.path.join("assets", self.sprite_folder, "idle.png")
+        return asset_cache.load_frames(path, ("npc", self.frame_width, self.frame_height, self.scale),
+                                       lambda: self.build_idle_frames(path))
+
+    def build_idle_frames(self, path):
         sheet = pygame.image.load(path).convert_alpha()
         frame_count = sheet.get_width() // self.frame_width
         frames = []
@@ -78,9 +85,10 @@ class NPC:
     def draw(self, screen):
         img = self.image.copy()
         img.set_alpha(self.alpha)
-        screen.blit(img, self.rect)
+        area = screen.blit(img, self.rect)
         if self.dialog_active:
             self.draw_dialog(screen)
+        return area
 
     def draw_dialog(self, screen):
         self.dialog_box_surface.fill((0, 0, 0, 230))
@@ -88,16 +96,16 @@ class NPC:
 
         if self.dialog_index < len(self.dialog_lines):
             line = self.dialog_lines[self.dialog_index]
-            text = self.dialog_font.render(f"{self.name}: {line}", True, (255, 255, 255))
+            text = text_cache.render(self.dialog_font, f"{self.name}: {line}", (255, 255, 255))
             self.dialog_box_surface.blit(text, (20, 40))
 
-            hint_font = pygame.font.SysFont("Arial", 20)
-            hint_text = hint_font.render("Press Enter", True, (200, 200, 200))
+            hint_font = get_sysfont("Arial", 20)
+            hint_text = text_cache.render(hint_font, "Press Enter", (200, 200, 200))
             hint_x = self.dialog_box_surface.get_width() - hint_text.get_width() - 20
             hint_y = self.dialog_box_surface.get_height() - hint_text.get_height() - 10
             self.dialog_box_surface.blit(hint_text, (hint_x, hint_y))
 
-        screen.blit(self.dialog_box_surface, (60, 870))
+        return screen.blit(self.dialog_box_surface, (60, 870))
 
     def is_near_player(self, player_rect, distance=80):
         return self.rect.colliderect(player_rect.inflate(distance, distance))
@@ -0,0 +1,180 @@
+import random
+import numpy as np
+import pygame
+from glow_cache import glow_cache
+from settings import GLOW_ALPHA_STEP
+
+COLUMNS = ("x", "y", "vx", "vy", "life", "size", "color")
+
+
+class ParticleSystem:
+    """Structure-of-arrays particle store shared by every emitter of one visual style.
+
+    Each particle is a row across numpy columns (position, velocity per 16 ms
+    step, remaining life in ms, radius, palette index). update()
+    integrates all of them at once and compacts dead rows with swap-remove;
+    draw() batches everything into one Surface.blits call, with circles taken
+    from glow_cache by (radius, colour, quantised alpha).
+
+    fade_ms:   alpha = life / fade_ms * peak_alpha, clamped to max_alpha.
+               None draws fully opaque, as for sparks and note glyphs.
+    images:    with images=True the palette holds surfaces (e.g. rendered note
+               glyphs) that are blitted as-is instead of circles; pass the
+               surface as `color` when emitting.
+    """
+
+    def __init__(self, gravity=0.0, fade_ms=None, peak_alpha=255, max_alpha=255, capacity=256, images=False):
+        self.gravity = gravity
+        self.fade_ms = fade_ms
+        self.peak_alpha = peak_alpha
+        self.max_alpha = max_alpha
+        self.images = images
+        self.count = 0
+        self.palette = []      # colours, or surfaces for image systems
+        self.palette_ids = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        old = {name: getattr(self, name) for name in COLUMNS}
+        self._allocate(capacity)
+        for name, column in old.items():
+            getattr(self, name)[:self.count] = column[:self.count]
+
+    def palette_index(self, entry):
+        key = id(entry) if self.images else entry
+        index = self.palette_ids.get(key)
+        if index is None:
+            index = self.palette_ids[key] = len(self.palette)
+            self.palette.append(entry)
+        return index
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def emit(self, x, y, vx, vy, life, size, color):
+        """Adds particles; any argument may be a scalar or an array (numpy broadcasting)."""
+        x, y, vx, vy, life, size = np.broadcast_arrays(x, y, vx, vy, life, size)
+        n = x.size
+        if n == 0:
+            return
+        start, end = self.count, self.count + n
+        if end > self.capacity:
+            self._grow(end)
+        self.x[start:end] = x.ravel()
+        self.y[start:end] = y.ravel()
+        self.vx[start:end] = vx.ravel()
+        self.vy[start:end] = vy.ravel()
+        self.life[start:end] = life.ravel()
+        self.size[start:end] = size.ravel()
+        self.color[start:end] = self.palette_index(color)
+        self.count = end
+
+    def emit_burst(self, x, y, count, speed, life, size, color, vy_bias=0.0):
+        """`count` particles from (x, y) in random directions; speed/life/size are (low, high) ranges.
+
+        Seeded from the `random` module so headless runs with a fixed seed stay reproducible.
+        """
+        rng = np.random.default_rng(random.getrandbits(32))
+        angle = rng.uniform(0, 2 * np.pi, count)
+        velocity = rng.uniform(speed[0], speed[1], count)
+        self.emit(x, y, np.cos(angle) * velocity, np.sin(angle) * velocity + vy_bias,
+                  rng.integers(life[0], life[1], count, endpoint=True),
+                  rng.integers(size[0], size[1], count, endpoint=True), color)
+
+    def update(self, dt=16):
+        n = self.count
+        if not n:
+            return
+        step = dt / 16
+        self.x[:n] += self.vx[:n] * step
+        self.y[:n] += self.vy[:n] * step
+        if self.gravity:
+            self.vy[:n] += self.gravity * step
+        self.life[:n] -= dt
+
+        # swap-remove: the live rows past the new end fill the holes before it
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if dead.size:
+            end = n - dead.size
+            holes = dead[dead < end]
+            if holes.size:
+                tail = end + np.flatnonzero(self.life[end:n] > 0)
+                for name in COLUMNS:
+                    column = getattr(self, name)
+                    column[holes] = column[tail]
+            self.count = end
+
+    def alphas(self, alpha_scale=1.0):
+        n = self.count
+        if self.fade_ms is None:
+            alpha = np.full(n, 255.0 * alpha_scale)
+        else:
+            alpha = np.clip(self.life[:n] / self.fade_ms * self.peak_alpha, 0, self.max_alpha) * alpha_scale
+        return (np.rint(alpha.astype(np.int32) / GLOW_ALPHA_STEP) * GLOW_ALPHA_STEP).clip(0, 255).astype(np.int32)
+
+    def draw(self, surface, size_offset=0, alpha_scale=1.0, special_flags=0, opaque=False):
+        """Blits every live particle in one call; returns the area covered, or None.
+
+        opaque=True ignores the fade for this pass (solid cores under a fading glow).
+        """
+        n = self.count
+        if not n:
+            return None
+        xs = self.x[:n].astype(np.int32)
+        ys = self.y[:n].astype(np.int32)
+
+        if self.images:
+            images = self.palette
+            sprites = [images[i] for i in self.color[:n].tolist()]
+            positions = zip(xs.tolist(), ys.tolist())
+            width = max(s.get_width() for s in images)
+            height = max(s.get_height() for s in images)
+            left, top = int(xs.min()), int(ys.min())
+            area = pygame.Rect(left, top, int(xs.max()) + width - left, int(ys.max()) + height - top)
+        else:
+            radius = np.maximum(self.size[:n] + size_offset, 0)
+            alpha = np.full(n, 255, dtype=np.int32) if opaque else self.alphas(alpha_scale)
+            visible = alpha > 0
+            if not visible.all():
+                xs, ys, radius, alpha = xs[visible], ys[visible], radius[visible], alpha[visible]
+                colors = self.color[:n][visible]
+            else:
+                colors = self.color[:n]
+            if not xs.size:
+                return None
+            # one glow_cache lookup per distinct (radius, colour, alpha) instead of per particle
+            keys = (radius.astype(np.int64) * 256 + alpha) * len(self.palette) + colors
+            unique, inverse = np.unique(keys, return_inverse=True)
+            palette = self.palette
+            lookup = []
+            for key in unique.tolist():
+                rest, color = divmod(key, len(palette))
+                r, a = divmod(rest, 256)
+                lookup.append(glow_cache.circle(r, palette[color], a))
+            sprites = [lookup[i] for i in inverse.tolist()]
+            positions = zip((xs - radius).tolist(), (ys - radius).tolist())
+            pad = int(radius.max()) + 1
+            left, top = int(xs.min()) - pad, int(ys.min()) - pad
+            area = pygame.Rect(left, top, int(xs.max()) + pad - left, int(ys.max()) + pad - top)
+
+        if special_flags:
+            surface.blits([(s, p, None, special_flags) for s, p in zip(sprites, positions)], doreturn=False)
+        else:
+            surface.blits(list(zip(sprites, positions)), doreturn=False)
+        return area
@@ -1,16 +1,23 @@
 import pygame
+from fonts import get_font, get_sysfont, MUSIC_FONT
+import game_clock
 import os
 from settings import (PLAYER_SPEED, SPRINT_SPEED, SPRITE_SIZE, ANIMATION_DELAY, DASH_SPEED,
-                      DASH_DURATION, DASH_COOLDOWN, SHOW_HITBOX_PLAYER)
+                      DASH_DURATION, DASH_COOLDOWN, SHOW_HITBOX_PLAYER, SPEED_FRAME_MS)
 from combo_tracker import ComboTracker
 from combo_effect import ComboEffectManager
 from note_type import NoteType
 from key_manager import KeyPressManager
-from skills_database import skill_database
+from skills_database import skill_database, skill_variants
 from exp_star import EXPStar
+from game_log import get_logger
+from text_cache import text_cache
+from asset_cache import asset_cache
 import random
 import math
 
+log = get_logger("player")
+
 
 
 class Player:
@@ -22,6 +29,9 @@ class Player:
         HITBOX_WIDTH = 60
         HITBOX_HEIGHT = 120
         self.rect = pygame.Rect(x, y, HITBOX_WIDTH, HITBOX_HEIGHT)
+        self.prev_pos = self.rect.topleft
+        # sub-pixel movement left over from earlier ticks
+        self.move_carry = [0.0, 0.0]
 
         self.hitbox_offset_x = (SPRITE_SIZE * 2.5 - HITBOX_WIDTH) // 2
         self.hitbox_offset_y = int((SPRITE_SIZE * 2.5 - HITBOX_HEIGHT) // 1.5)
@@ -70,6 +80,13 @@ class Player:
         self.charge_flash_timer = 0
 
         self.skill_cooldowns = {}
+        # combo_database name -> handler; a handler returns False while its skill is on cooldown
+        self.combo_actions = {
+            "heal_note": self.cast_heal_note,
+            "strike_beat_max": self.cast_strike_beat_max,
+            "note_flurry_max": self.cast_note_flurry_max,
+            "crescendo": self.cast_crescendo,
+        }
 
     def get_max_hp(self):
         return self.max_hp
@@ -84,43 +101,36 @@ class Player:
                 sheet_path = os.path.join(folder, animation_name)
 
                 if not os.path.exists(sheet_path):
-                    print(f"[WARN] Missing sprite: {sheet_path}")
+                    log.warn("Missing sprite: %s", sheet_path)
                     continue
 
-                sheet = pygame.image.load(sheet_path).convert_alpha()
-                sheet_width = sheet.get_width()
-                max_frames = sheet_width // SPRITE_SIZE
-                frame = frame_override if frame_override else max_frames
-
-                animations[anim_key] = {"up": [], "down": [], "left": [], "right": []}
-                for i in range(frame):
-                    # ป้องกันการอ่านเกินขอบภาพ
-                    if (i + 1) * SPRITE_SIZE > sheet_width:
-                        print(f"[WARN] Skipping frame {i} in '{anim_key}' — exceeds sheet width")
-                        break
-                    animations[anim_key]["up"].append(
-                        self.get_scaled_sprite(sheet, i, 3, SCALE_FACTOR))
-                    animations[anim_key]["down"].append(
-                        self.get_scaled_sprite(sheet, i, 0, SCALE_FACTOR))
-                    animations[anim_key]["left"].append(
-                        self.get_scaled_sprite(sheet, i, 1, SCALE_FACTOR))
-                    animations[anim_key]["right"].append(
-                        self.get_scaled_sprite(sheet, i, 2, SCALE_FACTOR))
+                animations[anim_key] = self.load_sheet_frames(sheet_path, frame_override, SCALE_FACTOR)
 
         return animations
+
     def load_single_animation(self, path, frames):
-        animations = {"up": [], "down": [], "left": [], "right": []}
         SCALE_FACTOR = 2.5
-        sheet = pygame.image.load(path).convert_alpha()
-
-        for i in range(frames):
-            animations["up"].append(self.get_scaled_sprite(sheet, i, 3, SCALE_FACTOR))
-            animations["down"].append(self.get_scaled_sprite(sheet, i, 0, SCALE_FACTOR))
-            animations["left"].append(self.get_scaled_sprite(sheet, i, 1, SCALE_FACTOR))
-            animations["right"].append(self.get_scaled_sprite(sheet, i, 2, SCALE_FACTOR))
-
+        animations = self.load_sheet_frames(path, frames, SCALE_FACTOR)
         return {os.path.splitext(os.path.basename(path))[0]: animations}
 
+    def load_sheet_frames(self, sheet_path, frame_count, scale):
+        """Scaled up/down/left/right frames of a sheet, read from the asset cache when it is current."""
+        def build():
+            sheet = pygame.image.load(sheet_path).convert_alpha()
+            sheet_width = sheet.get_width()
+            frames = []
+            for i in range(frame_count or sheet_width // SPRITE_SIZE):
+                # ป้องกันการอ่านเกินขอบภาพ
+                if (i + 1) * SPRITE_SIZE > sheet_width:
+                    log.warn("Skipping frame %s in '%s' — exceeds sheet width", i, sheet_path)
+                    break
+                for row in (3, 0, 1, 2):
+                    frames.append(self.get_scaled_sprite(sheet, i, row, scale))
+            return frames
+
+        frames = asset_cache.load_frames(sheet_path, ("player", frame_count, SPRITE_SIZE, scale), build)
+        return {direction: frames[n::4] for n, direction in enumerate(("up", "down", "left", "right"))}
+
     def get_scaled_sprite(self, sheet, frame, row, scale):
         sprite = sheet.subsurface((frame * SPRITE_SIZE, row * SPRITE_SIZE, SPRITE_SIZE, SPRITE_SIZE))
         return pygame.transform.scale(sprite, (int(SPRITE_SIZE * scale), int(SPRITE_SIZE * scale)))
@@ -154,16 +164,19 @@ class Player:
             self.exp -= self.max_exp
             self.level += 1
             self.max_exp = self.level * 5
-            print(f"[LEVEL UP] New level: {self.level}")
+            log.info("Level up! New level: %s", self.level)
 
-    def update_exp_stars(self, screen):
+    def update_exp_stars(self, screen, dt):
         for star in self.exp_stars[:]:
-            star.update()
+            star.update(dt)
             star.draw(screen)
             if star.check_collision():
                 self.gain_exp(star.amount)
                 self.exp_stars.remove(star)
 
+    def remember_position(self):
+        self.prev_pos = self.rect.topleft
+
     def move(self, keys, dt, current_time):
         shift_now = keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT]
         moving = keys[pygame.K_UP] or keys[pygame.K_DOWN] or keys[pygame.K_LEFT] or keys[pygame.K_RIGHT]
@@ -198,6 +211,14 @@ class Player:
             dx = speed
             self.direction = "right"
 
+        step = dt / SPEED_FRAME_MS
+        carry = self.move_carry
+        carry[0] += dx * step
+        carry[1] += dy * step
+        dx, dy = int(carry[0]), int(carry[1])
+        carry[0] -= dx
+        carry[1] -= dy
+
         if dx != 0 and not self.collision_handler.check_collision(self.rect, dx, 0):
             self.rect.x += dx
         if dy != 0 and not self.collision_handler.check_collision(self.rect, 0, dy):
@@ -216,14 +237,14 @@ class Player:
     def start_death(self):
         self.is_dead = True
         self.death_image = pygame.transform.rotate(self.image, 90)
-        self.death_start_time = pygame.time.get_ticks()
+        self.death_start_time = game_clock.get_ticks()
         self.start_game_over = True
 
     def take_damage(self, amount):
         if self.is_dead or self.barrier_active:
             return
         self.hp -= amount
-        self.damage_timer = pygame.time.get_ticks()
+        self.damage_timer = game_clock.get_ticks()
         if self.hp <= 0:
             self.start_death()
 
@@ -231,7 +252,7 @@ class Player:
         if not self.is_dead or self.image is None:
             return None, (0, 0), 255
 
-        elapsed = pygame.time.get_ticks() - self.death_start_time
+        elapsed = game_clock.get_ticks() - self.death_start_time
         duration = 1000  # milliseconds
         progress = min(elapsed / duration, 1.0)
 
@@ -280,7 +301,7 @@ class Player:
                 radius=radius,
                 damage=damage,
                 charge_ratio=charge_ratio,
-                font=pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", 36),
+                font=get_font(MUSIC_FONT, 36),
                 note_char="𝄝"
             )
 
@@ -339,7 +360,7 @@ class Player:
                 # ✅ ถ้า note นี้มี skill mapping
                 if skill:
                     if self.is_skill_on_cooldown(skill, current_time):
-                        print(f"[Cooldown] {skill.name} is on cooldown.")
+                        log.debug("%s is on cooldown.", skill.name)
                         return  # ❌ ไม่ใช้ skill, ไม่เพิ่ม note เข้าคอมโบ
 
                     # ✅ ใช้ skill ได้
@@ -359,81 +380,68 @@ class Player:
         last_used = self.skill_cooldowns.get(skill.name, -99999)
         return current_time - last_used < skill.cooldown
 
-    def update(self, current_time, enemy_manager):
+    def update(self, current_time, enemy_manager, dt):
         if self.is_dead:
             return
-        self.combo_tracker.update(current_time)
-        self.skill_effect_manager.update(current_time)
-        combo = list(self.combo_tracker.get_combo())
-        # heal check
-        if len(combo) == 2 and all(n == NoteType.HALF for n in combo):
-            skill = skill_database.get("heal_note")
-            if skill and not self.is_skill_on_cooldown(skill, current_time):
-                self.skill_cooldowns[skill.name] = current_time
-                heal_amount = abs(skill.damage)
-                self.hp = min(self.hp + heal_amount, self.get_max_hp())
-                pygame.mixer.Sound("assets/SFX/heal.wav").play()
-                self.skill_effect_manager.spawn_heal_effect(self)
-                print(f"[Heal] Player healed for {heal_amount} HP.")
-                self.combo_tracker.reset()
-        self.skill_effect_manager.check_skill_hits(enemy_manager.enemies)
+        self.combo_tracker.update(current_time, dt)
+        self.skill_effect_manager.update(current_time, dt)
+        self.skill_effect_manager.check_skill_hits(enemy_manager)
         if self.barrier_active and current_time >= self.barrier_end_time:
             self.barrier_active = False
-        self.update_animation(16)
-        # super slash check
-        if len(combo) == 4 and all(n == NoteType.QUARTER for n in combo):
-            base_skill = skill_database.get("strike_beat")
-            if base_skill and not self.is_skill_on_cooldown(base_skill, current_time):
-                import copy
-                big_slash = copy.deepcopy(base_skill)
-                big_slash.name = "Strike Beat MAX"
-                big_slash.damage = base_skill.damage * 2
-                big_slash.scale = 4
-
-                # ✅ ปรับ offset ใหม่ให้เหมาะกับ scale
-                base_scale = 3  # scale เดิมของ skill effect
-                scaled_offsets = {
-                    dir: (int(dx * big_slash.scale / base_scale), int(dy * big_slash.scale / base_scale))
-                    for dir, (dx, dy) in base_skill.effect_offsets.items()
-                }
-                big_slash.effect_offsets = scaled_offsets
-                big_slash.hitbox_sizes = dict(base_skill.hitbox_sizes)
-                big_slash.follow_caster = base_skill.follow_caster
-
-                #big_slash.animation_speed_override = 130
-                #big_slash.duration_override = 500
-
-                self.skill_cooldowns[big_slash.name] = current_time
-                self.set_animation("strike_beat", frame_override=base_skill.frames)
-                self.skill_effect_manager.spawn(big_slash, self, self.direction, current_time)
-                print("[Combo MAX] Triggered 4x QUARTER Slash!")
-                self.combo_tracker.reset()
-        # Super Projectile
-        if len(combo) == 8 and all(n == NoteType.EIGHTH for n in combo):
-            base_skill = skill_database.get("note_flurry")
-            if base_skill and not self.is_skill_on_cooldown(base_skill, current_time):
-                import copy
-                big_flurry = copy.deepcopy(base_skill)
-                big_flurry.name = "Note Flurry MAX"
-                big_flurry.damage = base_skill.damage * 2
-                big_flurry.is_max_combo = True  # ✅ ใช้ flag นี้เพื่อบอก Projectile ให้เปลี่ยนลักษณะ
-                self.skill_cooldowns[big_flurry.name] = current_time
-
-                if base_skill.animation_path:
-                    self.set_animation("note_flurry", frame_override=base_skill.frames)
-                self.skill_effect_manager.cast_note_flurry(self, override_skill=big_flurry)
-                print("[Combo MAX] Triggered 8x EIGHTH Shot!")
-                self.combo_tracker.reset()
-        # Crescendo check
-        if combo == [NoteType.HALF, NoteType.QUARTER, NoteType.EIGHTH, NoteType.EIGHTH]:
-            skill = skill_database.get("crescendo")
-            if skill and not self.is_skill_on_cooldown(skill, current_time):
-                self.skill_cooldowns[skill.name] = current_time
-                self.attack_boost_end_time = current_time + skill.duration
-                self.skill_effect_manager.spawn_crescendo_effect(self)
-                print("[Buff] Crescendo activated! 2x attack power for 5 seconds.")
+        self.update_animation(dt)
+        # a finished combo stays pending (e.g. its skill is cooling down) until it fires or the tracker resets
+        completed = self.combo_tracker.completed
+        if completed is not None:
+            action = self.combo_actions.get(completed)
+            if action is not None and action(current_time):
                 self.combo_tracker.reset()
 
+    def cast_heal_note(self, current_time):
+        skill = skill_database.get("heal_note")
+        if not skill or self.is_skill_on_cooldown(skill, current_time):
+            return False
+        self.skill_cooldowns[skill.name] = current_time
+        heal_amount = abs(skill.damage)
+        self.hp = min(self.hp + heal_amount, self.get_max_hp())
+        pygame.mixer.Sound("assets/SFX/heal.wav").play()
+        self.skill_effect_manager.spawn_heal_effect(self)
+        log.info("Player healed for %s HP.", heal_amount)
+        return True
+
+    def cast_strike_beat_max(self, current_time):
+        base_skill = skill_database.get("strike_beat")
+        if not base_skill or self.is_skill_on_cooldown(base_skill, current_time):
+            return False
+        big_slash = skill_variants["strike_beat_max"]
+        self.skill_cooldowns[big_slash.name] = current_time
+        self.set_animation("strike_beat", frame_override=base_skill.frames)
+        self.skill_effect_manager.spawn(big_slash, self, self.direction, current_time)
+        log.info("Combo MAX: triggered 4x QUARTER Slash!")
+        return True
+
+    def cast_note_flurry_max(self, current_time):
+        base_skill = skill_database.get("note_flurry")
+        if not base_skill or self.is_skill_on_cooldown(base_skill, current_time):
+            return False
+        big_flurry = skill_variants["note_flurry_max"]
+        self.skill_cooldowns[big_flurry.name] = current_time
+
+        if base_skill.animation_path:
+            self.set_animation("note_flurry", frame_override=base_skill.frames)
+        self.skill_effect_manager.cast_note_flurry(self, override_skill=big_flurry)
+        log.info("Combo MAX: triggered 8x EIGHTH Shot!")
+        return True
+
+    def cast_crescendo(self, current_time):
+        skill = skill_database.get("crescendo")
+        if not skill or self.is_skill_on_cooldown(skill, current_time):
+            return False
+        self.skill_cooldowns[skill.name] = current_time
+        self.attack_boost_end_time = current_time + skill.duration
+        self.skill_effect_manager.spawn_crescendo_effect(self)
+        log.info("Crescendo activated! 2x attack power for 5 seconds.")
+        return True
+
     def draw_combo_ui(self, screen, font, margin=60, spacing=28, height_offset=120):
         symbols = self.combo_tracker.get_combo_symbols()
         colors = self.combo_tracker.get_combo_colors()
@@ -445,10 +453,8 @@ class Player:
         scaled_data = []
 
         for symbol, color in reversed(list(zip(symbols, colors))):
-            surface = font.render(symbol, True, color)
-            scale = target_height / surface.get_height()
-            new_width = int(surface.get_width() * scale)
-            scaled_surface = pygame.transform.smoothscale(surface, (new_width, target_height))
+            scaled_surface = text_cache.render_scaled(font, symbol, color, target_height)
+            new_width = scaled_surface.get_width()
             total_width += new_width + spacing
             scaled_data.append((scaled_surface, new_width, color))
 
@@ -463,7 +469,7 @@ class Player:
         glow_rect = pygame.Rect(bar_x - 2, bar_y - 2, bar_width + 4, bar_height + 4)
         pygame.draw.rect(screen, glow_color, glow_rect, border_radius=12)
 
-        self.combo_effects.update_and_draw(screen, font)
+        effect_areas = self.combo_effects.update_and_draw(screen, font)
 
         bar_color = (60, 40, 100)
         border_color = (180, 160, 255)
@@ -481,6 +487,8 @@ class Player:
             screen.blit(surface, (x, y))
             x += w + spacing
 
+        area = glow_rect.unionall(effect_areas) if effect_areas else glow_rect
+
         if self.combo_tracker.is_alerting():
             pygame.draw.rect(screen, (255, 100, 100), (bar_x, bar_y, bar_width, bar_height), width=4, border_radius=12)
 
@@ -491,7 +499,7 @@ class Player:
                 colors = self.combo_tracker.get_combo_colors()
                 symbol_color_pairs = list(zip(symbols, colors))
 
-                self.combo_effects.trigger(center, symbol_color_pairs,
+                self.combo_effects.trigger(center, symbol_color_pairs, font,
                                            glow_rect=pygame.Rect(bar_x, bar_y, bar_width, bar_height),
                                            color_override=(255, 50, 50))  # สีแดงพิเศษ
         elif self.combo_tracker.is_success():
@@ -504,12 +512,13 @@ class Player:
                 colors = self.combo_tracker.get_combo_colors()
                 symbol_color_pairs = list(zip(symbols, colors))
 
-                self.combo_effects.trigger(center, symbol_color_pairs,
+                self.combo_effects.trigger(center, symbol_color_pairs, font,
                                            glow_rect=pygame.Rect(bar_x, bar_y, bar_width, bar_height))
 
         else:
             self._combo_success_shown = False
             self._combo_overflow_shown = False
+        return area
 
     def draw_exp_bar(self, screen):
         bar_width = 200
@@ -529,17 +538,19 @@ class Player:
         pygame.draw.rect(screen, (255, 230, 70), (x + 2, y + 2, fill_width - 4, bar_height - 4))
 
         # Text
-        font = pygame.font.SysFont(None, 24)
-        exp_text = font.render(f"EXP: {self.exp} / {self.max_exp}  Lv.{self.level}", True, (255, 255, 255))
-        screen.blit(exp_text, (x + bar_width + 10, y - 2))
+        font = get_sysfont(None, 24)
+        exp_text = text_cache.render(font, f"EXP: {self.exp} / {self.max_exp}  Lv.{self.level}", (255, 255, 255))
+        text_area = screen.blit(exp_text, (x + bar_width + 10, y - 2))
+        return text_area.union(pygame.Rect(x, y, bar_width, bar_height))
 
-    def draw_barrier_effect(self, screen):
+    def draw_barrier_effect(self, screen, rect=None):
         if not self.barrier_active:
-            return
+            return None
 
-        t = pygame.time.get_ticks()
-        center = self.rect.center
-        base_radius = max(self.rect.width, self.rect.height) // 2 + 10
+        rect = rect or self.rect
+        t = game_clock.get_ticks()
+        center = rect.center
+        base_radius = max(rect.width, rect.height) // 2 + 10
         pulse = 1.0 + 0.05 * math.sin(t / 200.0)
         radius = int(base_radius * pulse)
 
@@ -568,20 +579,22 @@ class Player:
             pygame.draw.circle(screen, (255, 255, 255, 80), (sparkle_x, sparkle_y), 2)
 
         # 🎵 โน้ตดนตรีหมุนรอบ barrier
-        note_font = pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", 18)
+        note_font = get_font(MUSIC_FONT, 18)
         symbols = ["𝄞", "♪", "𝅘𝅥", "♩"]
         orbit_r = radius - 8
         for i, sym in enumerate(symbols):
             angle = t * 0.002 + (2 * math.pi * i / len(symbols))
             nx = center[0] + math.cos(angle) * orbit_r
             ny = center[1] + math.sin(angle) * orbit_r
-            note = note_font.render(sym, True, (210, 180, 255))
+            note = text_cache.render(note_font, sym, (210, 180, 255)).copy()
             note.set_alpha(140)
             screen.blit(note, note.get_rect(center=(nx, ny)))
 
+        return pygame.Rect(center[0] - radius - 20, center[1] - radius - 20, radius * 2 + 40, radius * 2 + 40)
+
     def draw_buff_ui(self, screen, font):
         active_buffs = []
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
 
         # 📌 ตรวจสอบบัฟ Crescendo
         if hasattr(self, "attack_boost_end_time") and now < self.attack_boost_end_time:
@@ -589,7 +602,7 @@ class Player:
             active_buffs.append(("ATK x2", remaining, 5.0))  # name, remaining, max_time
 
         if not active_buffs:
-            return
+            return None
 
         margin = 20
         bar_width = 220
@@ -615,12 +628,12 @@ class Player:
             pygame.draw.circle(screen, (180, 50, 50), (icon_x, icon_y), icon_radius)
 
             # ✏️ x2 ตัวใหญ่ในวงกลม
-            icon_text = font.render("×2", True, (255, 255, 255))
+            icon_text = text_cache.render(font, "×2", (255, 255, 255))
             icon_rect = icon_text.get_rect(center=(icon_x, icon_y))
             screen.blit(icon_text, icon_rect)
 
             # 🏷 ชื่อบัฟ (อยู่ขวา icon)
-            label = font.render(buff_name, True, (255, 220, 220))
+            label = text_cache.render(font, buff_name, (255, 220, 220))
             screen.blit(label, (base_x + 30, y + 5))
 
             # 📊 Gradient bar
@@ -640,12 +653,16 @@ class Player:
             # ขอบบาร์ (optional)
             pygame.draw.rect(screen, (255, 255, 255, 50), (bar_x, bar_y, bar_width, bar_h), 1)
 
+        top = base_y - (len(active_buffs) - 1) * (bar_height + spacing)
+        return pygame.Rect(base_x, top, bar_width, base_y + bar_height - top)
+
     def draw_cooldowns(self, screen, font, current_time):
         spacing = 36
         margin = 20
         screen_height = screen.get_height()
 
         cooldown_entries = []
+        area = None
 
         for skill_key, skill in skill_database.items():
             last_used = self.skill_cooldowns.get(skill.name, -99999)
@@ -661,7 +678,7 @@ class Player:
             color = (200, 60, 60) if remaining > 0 else (30, 220, 30)
             outline_color = (255, 255, 255)
 
-            text_surf = font.render(show_text, True, color)
+            text_surf = text_cache.render(font, show_text, color)
             text_w, text_h = text_surf.get_size()
             x = margin
             offset_y = 40
@@ -670,17 +687,12 @@ class Player:
             # --- 🔲 วาดพื้นหลังโปร่งใส ---
             bg_rect = pygame.Surface((text_w + 12, text_h + 14), pygame.SRCALPHA)
             bg_rect.fill((0, 0, 0, 140))  # RGBA
-            screen.blit(bg_rect, (x - 6, y - 6))
+            bg_area = screen.blit(bg_rect, (x - 6, y - 6))
+            area = bg_area if area is None else area.union(bg_area)
 
-            # --- 🖋 วาดขอบข้อความ (outline) ---
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx != 0 or dy != 0:
-                        outline_surf = font.render(show_text, True, outline_color)
-                        screen.blit(outline_surf, (x + dx, y + dy))
-
-            # --- ✏️ วาดข้อความจริง ---
-            screen.blit(text_surf, (x, y))
+            # --- 🖋 วาดข้อความพร้อมขอบ (outline) ---
+            outlined = text_cache.render_outlined(font, show_text, color, outline_color)
+            screen.blit(outlined, (x - 1, y - 1))
 
             # --- 📊 วาด bar cooldown (เฉพาะตอน cooldown เหลือ) ---
             if remaining > 0:
@@ -694,6 +706,8 @@ class Player:
 
                 pygame.draw.rect(screen, (60, 60, 60), (bar_x, bar_y, bar_w, bar_h))  # พื้นหลัง bar
                 pygame.draw.rect(screen, (200, 60, 60), (bar_x, bar_y, fill_w, bar_h))  # เติม bar
+                area.union_ip(pygame.Rect(bar_x, bar_y, bar_w, bar_h))
+        return area
 
     def update_animation(self, dt):
         self.animation_timer += dt
@@ -702,7 +716,7 @@ class Player:
             self.frame += 1
             frames_list = self.animations[self.current_animation].get(self.direction, [])
             if not frames_list:
-                print(f"[ERROR] No frames found for {self.current_animation} - {self.direction}")
+                log.error("No frames found for %s - %s", self.current_animation, self.direction)
                 return
             else:
                 self.frame %= len(frames_list)
@@ -712,14 +726,17 @@ class Player:
         if self.is_dead:
             sprite, pos, alpha = self.update_death_effect()
             if sprite and alpha > 0:
-                screen.blit(sprite, pos)
-            return
+                return [screen.blit(sprite, pos)]
+            return []
 
-        offset_x = self.rect.x - self.hitbox_offset_x
-        offset_y = self.rect.y - self.hitbox_offset_y
+        # drawn where the player was part-way through the current tick
+        x, y = game_clock.interpolate(self.prev_pos, self.rect.topleft)
+        draw_rect = self.rect.move(int(x) - self.rect.x, int(y) - self.rect.y)
+        offset_x = draw_rect.x - self.hitbox_offset_x
+        offset_y = draw_rect.y - self.hitbox_offset_y
 
         draw_image = self.image
-        current_time = pygame.time.get_ticks()
+        current_time = game_clock.get_ticks()
         under_damage = current_time - self.damage_timer < self.damage_duration
 
         if under_damage:
@@ -729,16 +746,17 @@ class Player:
             tinted.blit(red_tint, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
             shake_x = random.randint(-2, 2)
             shake_y = random.randint(-2, 2)
-            screen.blit(tinted, (offset_x + shake_x, offset_y + shake_y))
+            areas = [screen.blit(tinted, (offset_x + shake_x, offset_y + shake_y))]
         else:
-            screen.blit(draw_image, (offset_x, offset_y))
+            areas = [screen.blit(draw_image, (offset_x, offset_y))]
 
-        self.skill_effect_manager.draw_crescendo_only(screen)
+        areas += self.skill_effect_manager.draw_crescendo_only(screen)
 
-        self.draw_barrier_effect(screen)
-        self.skill_effect_manager.draw(screen)
+        areas.append(self.draw_barrier_effect(screen, draw_rect))
+        areas += self.skill_effect_manager.draw(screen)
 
         if SHOW_HITBOX_PLAYER:
-            pygame.draw.rect(screen, (0, 255, 0), self.rect, 2)
+            areas.append(pygame.draw.rect(screen, (0, 255, 0), self.rect, 2))
+        return areas
 
 
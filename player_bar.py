@@ -1,6 +1,10 @@
 import pygame
+from fonts import get_sysfont
 import random
 import math
+from text_cache import text_cache
+
+NOTE_DRIFT = 70  # how far floating notes and fragments can stray outside a bar
 
 
 class FloatingNote:
@@ -97,8 +101,8 @@ class SymphonicHealthBar:
         self.pos = list(pos)
         self.base_pos = list(pos)
         self.size = size
-        self.font = pygame.font.SysFont("georgia", 22, bold=True)
-        self.label_font = pygame.font.SysFont("georgia", 20, bold=True)
+        self.font = get_sysfont("georgia", 22, bold=True)
+        self.label_font = get_sysfont("georgia", 20, bold=True)
 
         self.notes = []
         self.last_note_spawn = 0
@@ -172,12 +176,14 @@ class SymphonicHealthBar:
 
         self.aura.draw(screen)
 
-        label_text = self.label_font.render("HP", True, (255, 255, 255))
+        label_text = text_cache.render(self.label_font, "HP", (255, 255, 255))
         screen.blit(label_text, (x + 12, y + h // 2 - label_text.get_height() // 2))
 
-        hp_text = self.font.render(f"{int(self.current_hp)} / {int(self.max_hp)}", True, (255, 255, 255))
+        hp_text = text_cache.render(self.font, f"{int(self.current_hp)} / {int(self.max_hp)}", (255, 255, 255))
         screen.blit(hp_text, (x + w // 2 - hp_text.get_width() // 2, y + h // 2 - hp_text.get_height() // 2))
 
+        return pygame.Rect(self.base_pos, self.size).inflate(NOTE_DRIFT * 2, NOTE_DRIFT * 2)
+
 
 class SymphonicStaminaBar:
     def __init__(self, max_stamina, current_stamina=None, pos=(20, 80), size=(320, 40)):
@@ -187,8 +193,8 @@ class SymphonicStaminaBar:
         self.pos = list(pos)
         self.base_pos = list(pos)
         self.size = size
-        self.font = pygame.font.SysFont("georgia", 20, bold=True)
-        self.label_font = pygame.font.SysFont("georgia", 18, bold=True)
+        self.font = get_sysfont("georgia", 20, bold=True)
+        self.label_font = get_sysfont("georgia", 18, bold=True)
 
         self.notes = []
         self.last_note_spawn = 0
@@ -262,8 +268,10 @@ class SymphonicStaminaBar:
 
         self.aura.draw(screen)
 
-        label_text = self.label_font.render("Stamina", True, (255, 255, 255))
+        label_text = text_cache.render(self.label_font, "Stamina", (255, 255, 255))
         screen.blit(label_text, (x + 12, y + h // 2 - label_text.get_height() // 2))
 
-        st_text = self.font.render(f"{int(self.current_stamina)} / {int(self.max_stamina)}", True, (255, 255, 255))
+        st_text = text_cache.render(self.font, f"{int(self.current_stamina)} / {int(self.max_stamina)}", (255, 255, 255))
         screen.blit(st_text, (x + w // 2 - st_text.get_width() // 2, y + h // 2 - st_text.get_height() // 2))
+
+        return pygame.Rect(self.base_pos, self.size).inflate(NOTE_DRIFT * 2, NOTE_DRIFT * 2)
@@ -0,0 +1,41 @@
+class ObjectPool:
+    """Free list of resettable objects.
+
+    acquire(*args) reuses a released instance through obj.reset(*args) or, when
+    the free list is empty, builds one with factory(*args) and counts a miss.
+    At most `capacity` released objects are kept; extra releases are dropped
+    for the garbage collector.
+    """
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.capacity = capacity
+        self.free = []
+        self.reused = 0
+        self.misses = 0
+        self.dropped = 0
+
+    def acquire(self, *args):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            self.reused += 1
+        else:
+            obj = self.factory(*args)
+            self.misses += 1
+        return obj
+
+    def release(self, obj):
+        if len(self.free) < self.capacity:
+            self.free.append(obj)
+        else:
+            self.dropped += 1
+
+    @property
+    def reuse_rate(self):
+        total = self.reused + self.misses
+        return self.reused / total if total else 0.0
+
+    def stats(self):
+        return {"reused": self.reused, "misses": self.misses, "dropped": self.dropped,
+                "free": len(self.free), "reuse_rate": round(self.reuse_rate, 3)}
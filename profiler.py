@@ -0,0 +1,106 @@
+import csv
+import time
+from collections import deque
+import pygame
+
+PROFILER_WINDOW = 300  # frames kept for the percentile window (~5s at 60 FPS)
+
+
+class _Section:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.samples = {}   # stage -> deque of recent ms
+        self.totals = {}    # stage -> [count, sum_ms, max_ms] over the whole session
+        self.sections = {}
+        self.visible = False
+        self.last_frame_start = None
+
+    def section(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+
+    def record(self, name, ms):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.totals[name] = [0, 0.0, 0.0]
+        samples.append(ms)
+        total = self.totals[name]
+        total[0] += 1
+        total[1] += ms
+        if ms > total[2]:
+            total[2] = ms
+
+    def frame_tick(self):
+        now = time.perf_counter()
+        if self.last_frame_start is not None:
+            self.record("frame", (now - self.last_frame_start) * 1000)
+        self.last_frame_start = now
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        ordered = sorted(self.samples.get(name, ()))
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, int(p / 100 * len(ordered)))] for p in points)
+
+    def reset(self):
+        self.samples.clear()
+        self.totals.clear()
+        self.last_frame_start = None
+
+    def draw(self, screen, font, pos=(1450, 20)):
+        if not self.visible or not self.samples:
+            return None
+        lines = [f"{'stage':<20}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name in self.samples:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<20}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 20
+        bg = pygame.Surface((width, line_height * len(lines) + 16), pygame.SRCALPHA)
+        bg.fill((0, 0, 0, 180))
+        area = screen.blit(bg, pos)
+        for i, line in enumerate(lines):
+            color = (255, 230, 120) if i == 0 else (230, 230, 230)
+            screen.blit(font.render(line, True, color), (pos[0] + 10, pos[1] + 8 + i * line_height))
+        return area
+
+    def dump_csv(self, path):
+        if not self.samples:
+            return False
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "samples", "mean_ms", "max_ms", "p50_ms", "p95_ms", "p99_ms"])
+            for name in self.samples:
+                count, total, peak = self.totals[name]
+                p50, p95, p99 = self.percentiles(name)
+                writer.writerow([name, count, f"{total / count:.4f}", f"{peak:.4f}",
+                                 f"{p50:.4f}", f"{p95:.4f}", f"{p99:.4f}"])
+        return True
+
+
+frame_profiler = FrameProfiler()
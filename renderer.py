@@ -0,0 +1,82 @@
+import pygame
+from settings import DIRTY_FLIP_RATIO, DIRTY_MAX_RECTS, DIRTY_FULL_REFRESH_FRAMES
+
+
+class DirtyRectRenderer:
+    """Redraws a frame over a cached static layer and pushes only what changed.
+
+    The static layer (background fill + map) is rendered once per `static_key`.
+    Each frame, begin_frame() paints the layer back over last frame's dirty rects,
+    the caller draws the dynamic layers and mark()s their bounds, and present()
+    updates last frame's and this frame's rects. It falls back to a full flip when
+    the dirty area passes DIRTY_FLIP_RATIO of the screen or there are too many rects,
+    and repaints everything every DIRTY_FULL_REFRESH_FRAMES as a safety net.
+    """
+
+    def __init__(self, screen, flip_ratio=DIRTY_FLIP_RATIO, max_rects=DIRTY_MAX_RECTS,
+                 refresh_frames=DIRTY_FULL_REFRESH_FRAMES):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.flip_area = self.screen_rect.width * self.screen_rect.height * flip_ratio
+        self.max_rects = max_rects
+        self.refresh_frames = refresh_frames
+        self.static_layer = None
+        self.static_key = None
+        self.previous = []
+        self.dirty = []
+        self.full = True
+        self.frames_since_full = 0
+        self.full_flips = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Repaint and flip the whole screen next frame (e.g. after another scene drew over it)."""
+        self.full = True
+
+    def begin_frame(self, static_key, draw_static):
+        if self.static_layer is None or static_key != self.static_key:
+            self.static_layer = pygame.Surface(self.screen_rect.size).convert()
+            draw_static(self.static_layer)
+            self.static_key = static_key
+            self.full = True
+        if self.frames_since_full >= self.refresh_frames:
+            self.full = True
+
+        if self.full:
+            self.screen.blit(self.static_layer, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.static_layer, rect, rect)
+        self.dirty = []
+
+    def mark(self, rect):
+        if rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.dirty.append(rect)
+
+    def mark_all(self, rects):
+        for rect in rects:
+            self.mark(rect)
+
+    def present(self, update_display=True):
+        """Pushes the frame to the display; returns True if it was a full flip."""
+        rects = self.previous + self.dirty
+        full = (self.full or len(rects) > self.max_rects
+                or sum(r.width * r.height for r in rects) > self.flip_area)
+        if update_display:
+            if full:
+                pygame.display.flip()
+            else:
+                pygame.display.update(rects)
+
+        if full:
+            self.full_flips += 1
+            self.frames_since_full = 0
+        else:
+            self.partial_updates += 1
+            self.frames_since_full += 1
+        self.previous = self.dirty
+        self.full = False
+        return full
@@ -0,0 +1,218 @@
+import random
+import struct
+import pygame
+import game_clock
+from note_type import NoteType
+from game_log import get_logger
+
+log = get_logger("replay")
+
+# File layout (little endian):
+#   header  MAGIC, version, seed, key count        then key count x uint32 key codes,
+#           map name length (uint16)               then the map name (utf-8)
+#   frame   dt (ms, float64), held-key bitmask over the header's keys, KEYDOWN count,
+#           flags, ticks the frame simulated       then KEYDOWN count x uint32 key codes
+# (version 1 frames have no flags or tick count)
+MAGIC = b"SOTLREC1"
+VERSION = 2
+HEADER = struct.Struct("<8sHQB")
+KEY = struct.Struct("<I")
+NAME = struct.Struct("<H")
+FRAME = struct.Struct("<dIBBB")
+FRAME_V1 = struct.Struct("<dIB")
+# frame flag: GameScene.on_enter (resuming from pause) dropped the tick accumulator before this frame
+RESUMED = 1
+
+# every key GameScene and Player poll through keys[...] (at most 32, one bit each)
+RECORDED_KEYS = tuple(dict.fromkeys((
+    pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT,
+    pygame.K_LSHIFT, pygame.K_RSHIFT, pygame.K_a, pygame.K_s, pygame.K_f,
+    *(note.value["key"] for note in NoteType),
+)))
+# pausing happens outside the simulation; what it does to the tick loop (the ESC frame's
+# remaining ticks are skipped, resuming drops the accumulator) is logged per frame instead
+UNRECORDED_KEYDOWNS = {pygame.K_ESCAPE}
+
+_pending_path = None
+_active = None
+
+
+class HeldKeys:
+    """Stands in for pygame.key.get_pressed(): keys[K_x] is True while K_x is held."""
+
+    def __init__(self, held=()):
+        self.held = set(held)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+def start_simulation(seed):
+    """Puts game_clock and `random` into the state every recording and replay starts from."""
+    game_clock.use_fixed_clock()
+    random.seed(seed)
+
+
+def begin_frame(seed, frame):
+    """Reseeds `random` per frame (enemy EXP drops, particle bursts, HUD jitter).
+
+    Randomness consumed while drawing, or by code added in a later build, then
+    can't shift the rolls of the frames after it.
+    """
+    random.seed((seed << 32) | frame)
+
+
+def record_to(path):
+    """Makes the next GameScene record its session to `path` (see claim_recording)."""
+    global _pending_path
+    _pending_path = path
+
+
+def claim_recording(map_name):
+    """Returns a RecordingInput if record_to() asked for one; only the first GameScene gets it."""
+    global _pending_path, _active
+    if _pending_path is None:
+        return None
+    path, _pending_path = _pending_path, None
+    log.info("Recording session to %s", path)
+    _active = RecordingInput(path, map_name)
+    return _active
+
+
+def finish_recording():
+    """Closes the log started by claim_recording, if any."""
+    if _active is not None:
+        _active.close()
+
+
+class RecordingInput:
+    """GameScene input source that plays live and writes every frame to a replay log.
+
+    Keys come from the keyboard (or from `source`, e.g. a headless ScriptedInput)
+    and are reduced to RECORDED_KEYS before the game sees them, so the live run
+    and its replay read exactly the same input. The game clock runs on the
+    recorded frame dts and `random` is reseeded per frame from `seed`. A frame
+    is written by end_frame(), once GameScene knows how many ticks it ran.
+    """
+
+    def __init__(self, path, map_name, source=None, seed=None):
+        self.path = path
+        self.map_name = map_name
+        self.source = source
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        self.frame = 0
+        self.keys = HeldKeys()
+        self.events = []
+        self.pending = None
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.seed, len(RECORDED_KEYS)))
+        for key in RECORDED_KEYS:
+            self.file.write(KEY.pack(key))
+        name = map_name.encode("utf-8")
+        self.file.write(NAME.pack(len(name)) + name)
+        start_simulation(self.seed)
+
+    def advance(self, dt):
+        if self.source is not None:
+            dt = self.source.advance(dt)
+            pressed, events = self.source.keys, self.source.events
+        else:
+            pressed, events = pygame.key.get_pressed(), pygame.event.get()
+
+        mask = 0
+        held = []
+        for bit, key in enumerate(RECORDED_KEYS):
+            if pressed[key]:
+                mask |= 1 << bit
+                held.append(key)
+        keydowns = [e.key for e in events
+                    if e.type == pygame.KEYDOWN and e.key not in UNRECORDED_KEYDOWNS][:255]
+        self.pending = (dt, mask, keydowns)
+
+        self.keys = HeldKeys(held)
+        self.events = events
+        begin_frame(self.seed, self.frame)
+        self.frame += 1
+        return dt
+
+    def end_frame(self, ticks, resumed):
+        """Writes the frame advance() started: `ticks` simulated, `resumed` if on_enter ran before it."""
+        if self.pending is None or self.file.closed:
+            return
+        dt, mask, keydowns = self.pending
+        self.pending = None
+        self.file.write(FRAME.pack(dt, mask, len(keydowns), RESUMED if resumed else 0, ticks))
+        for key in keydowns:
+            self.file.write(KEY.pack(key))
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            log.info("Recorded %s frames to %s", self.frame, self.path)
+
+
+class ReplayInput:
+    """Plays a replay log back into GameScene: recorded dts, held keys, KEYDOWN events and seeds.
+
+    A replay follows a single GameScene, so it ends when the recorded session
+    left it (game over); frames recorded after a retry are not played. The
+    pause itself isn't replayed: `resumed` and `tick_limit` repeat what it did
+    to the recorded frame's tick loop.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, self.seed, key_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version not in (1, VERSION):
+            raise ValueError(f"{path} is not a v1-v{VERSION} replay log")
+        frame_struct = FRAME if version == VERSION else FRAME_V1
+        offset = HEADER.size
+        keys = struct.unpack_from(f"<{key_count}I", data, offset)
+        offset += KEY.size * key_count
+        (name_length,) = NAME.unpack_from(data, offset)
+        offset += NAME.size
+        self.map_name = data[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+
+        self.frames = []
+        # a log cut short (the game crashed mid-write) just loses its last partial frame
+        while offset + frame_struct.size <= len(data):
+            dt, mask, count, *ticked = frame_struct.unpack_from(data, offset)
+            offset += frame_struct.size
+            if offset + KEY.size * count > len(data):
+                break
+            keydowns = struct.unpack_from(f"<{count}I", data, offset)
+            offset += KEY.size * count
+            held = [key for bit, key in enumerate(keys) if mask >> bit & 1]
+            # v1 logs didn't record pauses: never resumed, ticks left to the accumulator
+            flags, ticks = ticked or (0, None)
+            self.frames.append((dt, held, keydowns, bool(flags & RESUMED), ticks))
+
+        self.frame = 0
+        self.keys = HeldKeys()
+        self.events = []
+        self.resumed = False
+        self.tick_limit = None
+        start_simulation(self.seed)
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def finished(self):
+        return self.frame >= len(self.frames)
+
+    def advance(self, dt):
+        if self.finished:
+            self.keys = HeldKeys()
+            self.events = []
+            self.resumed = False
+            self.tick_limit = None
+            return dt
+        dt, held, keydowns, self.resumed, self.tick_limit = self.frames[self.frame]
+        self.keys = HeldKeys(held)
+        self.events = [pygame.event.Event(pygame.KEYDOWN, key=key) for key in keydowns]
+        begin_frame(self.seed, self.frame)
+        self.frame += 1
+        return dt
@@ -4,9 +4,11 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import pygame
+from fonts import get_font, get_sysfont, MUSIC_FONT
+import game_clock
 import math
 from .base_scene import BaseScene
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BG_COLOR
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BG_COLOR, SHOW_PROFILER, SIM_TICK_MS
 from player import Player
 from collisions import CollisionHandler
 from map import Map
@@ -15,27 +17,51 @@ from enemy import EnemyManager, global_exp_stars
 from player_bar import SymphonicHealthBar, SymphonicStaminaBar
 from stamina_system import StaminaSystem
 from skill_effect import SkillEffectManager
+from profiler import frame_profiler
+from renderer import DirtyRectRenderer
+from map_transition import MapTransition, DONE
+from map_prefetch import map_prefetcher
+from replay import claim_recording
+from game_log import get_logger
+
+log = get_logger("game_scene")
 
 
 class GameScene(BaseScene):
 
-    def __init__(self, screen):
+    def __init__(self, screen, map_name="tutorial_hall", headless=False, fixed_dt=None, input_source=None):
         super().__init__(screen)
-        self.font = pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", 72)
-        self.cooldown_font = pygame.font.SysFont("Arial", 20)
+        # headless runs skip display flips; fixed_dt replaces clock.tick
+        self.headless = headless
+        self.fixed_dt = fixed_dt
+        # input sources replace the keyboard and may substitute the frame dt (replays);
+        # a session started with `main.py --record` gets a RecordingInput here
+        self.input_source = input_source if input_source is not None else claim_recording(map_name)
+        # the simulation always runs on game_clock's fixed ticks, live or headless
+        if not game_clock.is_fixed():
+            game_clock.use_fixed_clock(pygame.time.get_ticks())
+        self.pending_events = []
+        self.font = get_font(MUSIC_FONT, 72)
+        self.cooldown_font = get_sysfont("Arial", 20)
+        self.profiler_font = get_sysfont("consolas", 16)
+        self.profiler = frame_profiler
+        self.profiler.visible = SHOW_PROFILER
+        self.renderer = DirtyRectRenderer(screen)
         pygame.display.set_caption("Symphony of the Lost")
         self.clock = pygame.time.Clock()
         self.stamina = StaminaSystem()
         self.skill_effect_manager = SkillEffectManager()
         self.fade_alpha = 0
         self.fade_speed = 5
-        self.current_map = Map("tutorial_hall", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.current_map = Map(map_name, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        map_prefetcher.prefetch_neighbours(map_name, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.transition = None
         self.cutscene_mode = self.current_map.cutscene_mode
         self.collision_handler = CollisionHandler(self.current_map.get_collision_rects())
         self.player = Player(500, 800, self.collision_handler, self.skill_effect_manager)
         self.player_hp_bar = SymphonicHealthBar(max_hp=10)
         self.stamina_bar = SymphonicStaminaBar(max_stamina=50)
-        self.enemy_manager = EnemyManager(self.collision_handler)
+        self.enemy_manager = EnemyManager(self.collision_handler, self.current_map.navigation)
         if self.cutscene_mode:
             self.enemy_spawn_pending = True
             self.enemy_fade_in = False
@@ -46,6 +72,8 @@ class GameScene(BaseScene):
             self.enemy_manager.set_alpha(255)
             self.enemy_spawn_pending = False
         self.running = True
+        # set by on_enter; the next frame tells a recording it came back from a pause
+        self.resumed = False
         self.scene_state = "play"
         self.game_over_scene = None
         self.death_time = None
@@ -57,31 +85,89 @@ class GameScene(BaseScene):
 
 
     def handle_map_transition(self):
-        result = self.current_map.check_transition(self.player.rect)
-        if result:
-            target_map = result["target_map"]
-            new_map = Map(target_map, (SCREEN_WIDTH, SCREEN_HEIGHT))
-            self.current_map.fade(self.screen)
-            self.current_map = new_map
-            self.enemy_manager = EnemyManager(self.collision_handler)
-            self.enemy_manager.spawn_from_data(self.current_map.enemy_data, self.player)
-            self.skill_effect_manager.check_skill_hits(self.enemy_manager.enemies)
-            self.current_map.fade(self.screen)
-
-            new_x, new_y = result["player_pos"]
-            if new_x is not None:
-                self.player.rect.x = new_x
-            if new_y is not None:
-                self.player.rect.y = new_y
-
-            self.collision_handler = CollisionHandler(self.current_map.get_collision_rects())
-            self.player.collision_handler = self.collision_handler
-            enemy_rects = [e.hitbox for e in self.enemy_manager.enemies if not e.is_dead()]
-            self.collision_handler.add_dynamic(enemy_rects)
+        if self.transition is None:
+            result = self.current_map.check_transition(self.player.rect)
+            if not result:
+                return
+            self.transition = MapTransition(result, (SCREEN_WIDTH, SCREEN_HEIGHT))
+
+        new_map = self.transition.update()
+        if new_map is not None:
+            self.enter_map(new_map, self.transition.player_pos)
+        if self.transition.state == DONE:
+            self.transition = None
+
+    def enter_map(self, new_map, player_pos):
+        self.current_map = new_map
+        map_prefetcher.prefetch_neighbours(new_map.name, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.collision_handler = CollisionHandler(self.current_map.get_collision_rects())
+        self.player.collision_handler = self.collision_handler
+        self.enemy_manager = EnemyManager(self.collision_handler, self.current_map.navigation)
+        self.enemy_manager.spawn_from_data(self.current_map.enemy_data, self.player)
+        self.skill_effect_manager.check_skill_hits(self.enemy_manager)
+
+        new_x, new_y = player_pos
+        if new_x is not None:
+            self.player.rect.x = new_x
+        if new_y is not None:
+            self.player.rect.y = new_y
+        # a teleport, so don't slide the player across the screen on the next frames
+        self.player.remember_position()
+
+    def get_events(self):
+        if self.input_source is not None:
+            return self.input_source.events
+        return pygame.event.get()
+
+    def get_pressed(self):
+        if self.input_source is not None:
+            return self.input_source.keys
+        return pygame.key.get_pressed()
 
     def update(self):
-        dt = self.clock.tick(FPS)
-        current_time = pygame.time.get_ticks()
+        """Runs as many fixed SIM_TICK_MS ticks as the time since the last frame covers (often 0 or 2)."""
+        if self.fixed_dt is not None:
+            frame_ms = self.fixed_dt
+        else:
+            frame_ms = self.clock.tick(FPS)
+        source = self.input_source
+        resumed, self.resumed = self.resumed, False
+        if source is not None:
+            frame_ms = source.advance(frame_ms)
+            # a replay doesn't pause, so it repeats what the recorded pauses did to the tick loop
+            if getattr(source, "resumed", False):
+                game_clock.reset_accumulator()
+        self.profiler.frame_tick()
+        # key presses wait for the next tick, so a frame that simulates nothing doesn't drop them
+        self.pending_events += self.get_events()
+
+        ticks = game_clock.accumulate(frame_ms)
+        tick_limit = getattr(source, "tick_limit", None)
+        if tick_limit is not None:
+            ticks = min(ticks, tick_limit)
+        ran = 0
+        while ran < ticks:
+            self.tick(SIM_TICK_MS)
+            ran += 1
+            if self.manager.scene is not self or not self.running:
+                break
+        if hasattr(source, "end_frame"):
+            source.end_frame(ran, resumed)
+
+    def remember_positions(self):
+        """Start-of-tick positions; draw() interpolates from these to the current ones."""
+        self.player.remember_position()
+        self.enemy_manager.remember_positions()
+        for star in global_exp_stars:
+            star.remember_position()
+        self.skill_effect_manager.remember_positions()
+
+    def tick(self, dt):
+        game_clock.advance(dt)
+        current_time = game_clock.get_ticks()
+        profiler = self.profiler
+        self.remember_positions()
+        events, self.pending_events = self.pending_events, []
 
         # ✅ Cutscene logic block (ก่อน input event)
         if self.cutscene_mode:
@@ -123,7 +209,7 @@ class GameScene(BaseScene):
 
             return
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -143,79 +229,124 @@ class GameScene(BaseScene):
                         if npc.dialog_active:
                             npc.advance_dialog()
 
-        self.handle_map_transition()
-        self.current_map.update_npcs(dt)
-
-        keys = pygame.key.get_pressed()
-        self.player.move(keys, dt, current_time)
-        self.player.update_dash(current_time)
-        self.stamina.update(dt, current_time)
-        self.player_hp_bar.update(self.player.hp, dt)
-        self.stamina_bar.update(self.stamina.current_stamina, dt)
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
 
-        for star in global_exp_stars[:]:
-            star.update()
-            if star.check_collision():
-                self.player.gain_exp(star.amount)
-                global_exp_stars.remove(star)
+        with profiler.section("transition"):
+            map_prefetcher.poll()
+            self.handle_map_transition()
+        if self.transition is not None and self.transition.blocking:
+            return
+        with profiler.section("npcs"):
+            self.current_map.update_npcs(dt)
 
-        self.enemy_manager.update_all(self.player.rect, dt, self.player)
-        self.collision_handler.dynamic_objects = [e.hitbox for e in self.enemy_manager.enemies if not e.is_dead()]
-        self.player.handle_input(keys, current_time)
-        self.player.update(current_time, self.enemy_manager)
-        self.skill_effect_manager.update_projectiles(self.screen, self.enemy_manager.enemies, dt)
+        keys = self.get_pressed()
+        with profiler.section("player_move"):
+            self.player.move(keys, dt, current_time)
+            self.player.update_dash(current_time)
+            self.stamina.update(dt, current_time)
+        with profiler.section("hud_update"):
+            self.player_hp_bar.update(self.player.hp, dt)
+            self.stamina_bar.update(self.stamina.current_stamina, dt)
+
+        with profiler.section("exp_stars"):
+            for star in global_exp_stars[:]:
+                star.update(dt)
+                if star.check_collision():
+                    self.player.gain_exp(star.amount)
+                    global_exp_stars.remove(star)
+
+        with profiler.section("enemies"):
+            self.enemy_manager.update_all(self.player.rect, dt, self.player)
+        with profiler.section("player_update"):
+            self.player.handle_input(keys, current_time)
+            self.player.update(current_time, self.enemy_manager, dt)
+        with profiler.section("projectiles"):
+            self.skill_effect_manager.update_projectiles(self.enemy_manager, dt)
 
         if self.current_map.has_enemies and not self.current_map.cleared:
             if self.enemy_manager.all_defeated():
-                self.current_map.mark_cleared()
+                for rect in self.current_map.mark_cleared():
+                    self.collision_handler.remove_static(rect)
 
     def retry(self):
         self.current_map = Map(self.current_map.name, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.transition = None
         self.collision_handler = CollisionHandler(self.current_map.get_collision_rects())
         start_x, start_y = MAP_PROFILES[self.current_map.name].get("starting_pos", (500, 700))
         self.player = Player(start_x, start_y, self.collision_handler, self.skill_effect_manager)
         self.player.is_dead = False
         self.player_hp_bar = SymphonicHealthBar(max_hp=10)
-        self.enemy_manager = EnemyManager(self.collision_handler)
+        self.enemy_manager = EnemyManager(self.collision_handler, self.current_map.navigation)
         self.enemy_manager.spawn_from_data(self.current_map.enemy_data, self.player)
-        self.collision_handler.clear_dynamic()
-        enemy_rects = [e.hitbox for e in self.enemy_manager.enemies if not e.is_dead()]
-        self.collision_handler.add_dynamic(enemy_rects)
-        print("[DEBUG] Dynamic collision count:", len(self.collision_handler.dynamic_objects))
+        if log.debug_on:
+            log.debug("Dynamic collision count: %s", len(self.collision_handler.dynamic_objects))
         self.fade_alpha = 0
         self.game_over_scene = None
 
+    def on_enter(self):
+        # another scene (pause, settings) may have drawn over the whole screen
+        self.renderer.invalidate()
+        # time spent in that scene isn't simulated
+        self.clock.tick()
+        game_clock.reset_accumulator()
+        self.resumed = True
+
+    def draw_background(self, surface):
+        surface.fill(BG_COLOR)
+        self.current_map.draw(surface)
+
     def draw(self):
-        self.screen.fill(BG_COLOR)
-        self.current_map.draw(self.screen)
-        self.current_map.draw_npcs(self.screen)
+        profiler = self.profiler
+        renderer = self.renderer
+        with profiler.section("draw_map"):
+            # the map only changes on transition, so it lives in the renderer's cached layer
+            renderer.begin_frame(self.current_map, self.draw_background)
+            renderer.mark_all(self.current_map.draw_npcs(self.screen))
 
-        for star in global_exp_stars[:]:
-            star.draw(self.screen)
+        with profiler.section("draw_exp_stars"):
+            for star in global_exp_stars[:]:
+                renderer.mark(star.draw(self.screen))
 
-        self.enemy_manager.draw_all(self.screen)
+        with profiler.section("draw_enemies"):
+            renderer.mark_all(self.enemy_manager.draw_all(self.screen))
 
         # ✅ วาด skill effects (main effects)
-        self.skill_effect_manager.draw(self.screen)
-
-        # ✅ projectile และ impact (ตัวนี้ถูกวาดตอน update_projectiles แล้ว)
-        self.skill_effect_manager.update_projectiles(self.screen, self.enemy_manager.enemies, 0)
+        with profiler.section("draw_skill_effects"):
+            renderer.mark_all(self.skill_effect_manager.draw(self.screen))
+
+        # ✅ projectile และ impact
+        with profiler.section("draw_projectiles"):
+            renderer.mark_all(self.skill_effect_manager.draw_projectiles(self.screen))
+
+        with profiler.section("draw_player"):
+            renderer.mark_all(self.player.draw(self.screen))
+        with profiler.section("draw_hud_bars"):
+            renderer.mark(self.player_hp_bar.draw(self.screen))
+            renderer.mark(self.stamina_bar.draw(self.screen))
+            renderer.mark(self.player.draw_exp_bar(self.screen))
+        with profiler.section("draw_combo_ui"):
+            renderer.mark(self.player.draw_combo_ui(self.screen, self.font))
+        with profiler.section("draw_cooldowns"):
+            renderer.mark(self.player.draw_cooldowns(self.screen, self.cooldown_font, game_clock.get_ticks()))
+            renderer.mark(self.player.draw_buff_ui(self.screen, self.cooldown_font))
+
+        with profiler.section("draw_dialog"):
+            for npc in self.current_map.npc_list:
+                if npc.dialog_active:
+                    renderer.mark(npc.draw_dialog(self.screen))
 
-        self.player.draw(self.screen)
-        self.player_hp_bar.draw(self.screen)
-        self.stamina_bar.draw(self.screen)
-        self.player.draw_exp_bar(self.screen)
-        self.player.draw_combo_ui(self.screen, self.font)
-        self.player.draw_cooldowns(self.screen, self.cooldown_font, pygame.time.get_ticks())
-        self.player.draw_buff_ui(self.screen, self.cooldown_font)
+        if self.transition is not None:
+            renderer.mark(self.transition.draw(self.screen))
 
-        for npc in self.current_map.npc_list:
-            if npc.dialog_active:
-                npc.draw_dialog(self.screen)
+        renderer.mark(profiler.draw(self.screen, self.profiler_font))
 
-        pygame.display.update()
+        with profiler.section("display_update"):
+            renderer.present(update_display=not self.headless)
 
     def handle_events(self):
+        if self.input_source is not None:
+            return  # update() reads this frame's events from the input source
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
@@ -1,4 +1,5 @@
 import pygame
+from fonts import get_font, CINZEL_FONT
 import math
 import random
 from .base_scene import BaseScene
@@ -37,9 +38,9 @@ class GameOverScene(BaseScene):
         self.last_particle_time = 0
         self.bg_image = pygame.image.load("assets/scene/gameover_bg.png").convert()
         self.bg_image = pygame.transform.scale(self.bg_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.tagline_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 30)
-        self.title_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 80)
-        self.option_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 42)
+        self.tagline_font = get_font(CINZEL_FONT, 30)
+        self.title_font = get_font(CINZEL_FONT, 80)
+        self.option_font = get_font(CINZEL_FONT, 42)
 
     def on_enter(self):
         pygame.mixer.music.fadeout(2000)
@@ -1,6 +1,7 @@
 import sys
 import os
 import pygame
+from fonts import get_font, MUSIC_FONT
 import random
 import math
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -8,6 +9,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from .base_scene import BaseScene
 from .game_scene import GameScene
 from .setting_scene import SettingScene
+from game_log import get_logger
+
+log = get_logger("menu_scene")
 
 class FloatingNote:
     def __init__(self, x, y):
@@ -16,7 +20,7 @@ class FloatingNote:
         self.speed = random.uniform(0.2, 0.5)
         self.alpha = 255
         self.symbol = random.choice(["♪", "♫", "𝄞"])
-        self.font = pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", random.randint(20, 30))
+        self.font = get_font(MUSIC_FONT, random.randint(20, 30))
 
     def update(self):
         self.y -= self.speed
@@ -53,9 +57,9 @@ class MenuScene(BaseScene):
         self.selected = 0
 
         self.font_path = "assets/fonts/Cinzel-Regular.ttf"
-        self.title_font = pygame.font.Font(self.font_path, 72)
-        self.option_font = pygame.font.Font(self.font_path, 40)
-        self.small_font = pygame.font.Font(self.font_path, 20)
+        self.title_font = get_font(self.font_path, 72)
+        self.option_font = get_font(self.font_path, 40)
+        self.small_font = get_font(self.font_path, 20)
 
         self.color_selected = (210, 140, 255)
         self.color_unselected = (230, 230, 255)
@@ -92,13 +96,13 @@ class MenuScene(BaseScene):
             pygame.mixer.music.set_volume(0.5)
             pygame.mixer.music.play(-1)
         except Exception as e:
-            print("Music error:", e)
+            log.warn("Music error: %s", e)
 
         try:
             self.select_sound = pygame.mixer.Sound("assets/sfx/select.wav")
             self.enter_sound = pygame.mixer.Sound("assets/sfx/enter.wav")
         except Exception as e:
-            print("SFX error:", e)
+            log.warn("SFX error: %s", e)
 
     def on_enter(self):
         self.fade_alpha = 255
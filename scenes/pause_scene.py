@@ -1,4 +1,5 @@
 import pygame
+from fonts import get_font, MUSIC_FONT, CINZEL_FONT
 from .base_scene import BaseScene
 from settings import SCREEN_WIDTH, SCREEN_HEIGHT
 from .setting_scene import SettingScene
@@ -11,9 +12,9 @@ class PauseScene(BaseScene):
         self.game_scene = game_scene
         self.running = True
 
-        self.title_font = pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", 72)
-        self.menu_font = pygame.font.Font("assets/fonts/NotoMusic-Regular.ttf", 36)
-        self.subtitle_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 24)
+        self.title_font = get_font(MUSIC_FONT, 72)
+        self.menu_font = get_font(MUSIC_FONT, 36)
+        self.subtitle_font = get_font(CINZEL_FONT, 24)
 
         self.options = ["Resume", "Settings", "Back to Menu"]
         self.selected_index = 0
@@ -1,6 +1,7 @@
 import sys
 import os
 import pygame
+from fonts import get_font, CINZEL_FONT
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from .base_scene import BaseScene
@@ -38,9 +39,9 @@ class SettingScene(BaseScene):
         self.overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
         self.overlay.fill((0, 0, 0, 120))
 
-        self.title_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 64)
-        self.option_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 36)
-        self.subtitle_font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 24)
+        self.title_font = get_font(CINZEL_FONT, 64)
+        self.option_font = get_font(CINZEL_FONT, 36)
+        self.subtitle_font = get_font(CINZEL_FONT, 24)
 
         self.select_sound = pygame.mixer.Sound("assets/sfx/select.wav")
         self.enter_sound = pygame.mixer.Sound("assets/sfx/enter.wav")
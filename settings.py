@@ -23,4 +23,49 @@ SFX_VOLUME = 0.5
 
 BG_COLOR = (30, 30, 30)
 
+SHOW_PROFILER = False
+PROFILER_CSV = "profiler_report.csv"
+
+# DEBUG / INFO / WARN / ERROR / OFF; LOG_LEVELS overrides per module, e.g. {"enemy": "DEBUG"}
+LOG_LEVEL = "INFO"
+LOG_LEVELS = {}
+LOG_TO_CONSOLE = True
+LOG_BUFFER_SIZE = 2000
+LOG_CRASH_FILE = "crash_log.txt"
+
+TEXT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+GLOW_CACHE_MAX_BYTES = 24 * 1024 * 1024
+GLOW_ALPHA_STEP = 8  # glow alphas are rounded to this step so fades reuse a handful of sprites
+
+# Object pools for short-lived skill objects (free instances kept for reuse)
+PROJECTILE_POOL_SIZE = 32
+DAMAGE_TEXT_POOL_SIZE = 48  # also the cap on damage labels alive at once
+
+# Dirty-rect renderer: full flip once the changed area passes this share of the screen
+DIRTY_FLIP_RATIO = 0.45
+DIRTY_MAX_RECTS = 200
+DIRTY_FULL_REFRESH_FRAMES = 300
+
+# Map transitions: the next map loads during the fade-out; control returns when the fade-in starts
+TRANSITION_FADE_OUT_MS = 250
+TRANSITION_FADE_IN_MS = 250
+TRANSITION_TTI_BUDGET_MS = 400  # time-to-interactive past this is logged as a warning
+MAP_CACHE_SIZE = 4  # pre-scaled room backgrounds kept in memory (~8 MB each at 1920x1080)
+PREFETCH_WAIT_MS = 2  # per frame, a loading map waits this long for its in-flight prefetch
+
+# Scaled, pre-sliced frames stored as raw pixels, keyed by source file hash + scale
+ASSET_CACHE_DIR = ".asset_cache"
+ASSET_CACHE_ENABLED = True
+
+# Enemy navigation: collision rects are rasterised into cells of this size for the flow field
+NAV_CELL_SIZE = 32
+
+# Simulation runs in fixed ticks whatever the render rate (FPS only caps rendering); after a
+# long hitch at most MAX_TICKS_PER_FRAME ticks are caught up and the rest of the time is dropped
+SIM_TICK_RATE = 60
+SIM_TICK_MS = 1000 / SIM_TICK_RATE
+MAX_TICKS_PER_FRAME = 5
+# PLAYER_SPEED, enemy and EXP star speeds are pixels per frame at 60 FPS; movement scales by dt / this
+SPEED_FRAME_MS = 1000 / 60
+
 
@@ -1,9 +1,71 @@
 from settings import SHOW_HITBOX_PLAYER
 import pygame
+from fonts import get_font, CINZEL_FONT
+import game_clock
 import math
 import random
 import os
-from damage_label import FloatingDamageText
+from damage_label import DamageTextPool
+from pool import ObjectPool
+from settings import PROJECTILE_POOL_SIZE
+from text_cache import text_cache
+from glow_cache import glow_cache
+from particles import ParticleSystem
+from asset_cache import asset_cache
+
+# skill sheets are 64x64 frames with one row per direction
+SKILL_FRAME_SIZE = 64
+SKILL_SHEET_ROWS = ("right", "left", "up", "down")
+# (animation_path, frames, scale) -> {direction: frames}, shared by every SkillEffect
+_frame_sets = {}
+
+
+def particle_bounds(particles, pad):
+    """Bounding rect of [x, y, ...] particles, padded by their largest draw radius."""
+    if not particles:
+        return None
+    xs = [p[0] for p in particles]
+    ys = [p[1] for p in particles]
+    left, top = int(min(xs)) - pad, int(min(ys)) - pad
+    return pygame.Rect(left, top, int(max(xs)) + pad + 1 - left, int(max(ys)) + pad + 1 - top)
+
+
+def build_frame_set(sprite_path, num_frames, scale):
+    if not sprite_path or not os.path.isfile(sprite_path):
+        return {direction: [] for direction in SKILL_SHEET_ROWS}
+
+    def build():
+        sheet = pygame.image.load(sprite_path).convert_alpha()
+        size = SKILL_FRAME_SIZE
+        frames = []
+        for row in range(len(SKILL_SHEET_ROWS)):
+            for i in range(num_frames):
+                frame_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+                frame_surface.blit(sheet, (0, 0), pygame.Rect(i * size, row * size, size, size))
+                frames.append(pygame.transform.scale(frame_surface, (int(size * scale), int(size * scale))))
+        return frames
+
+    frames = asset_cache.load_frames(sprite_path, ("skill", num_frames, SKILL_FRAME_SIZE, scale), build)
+    return {direction: frames[row * num_frames:(row + 1) * num_frames]
+            for row, direction in enumerate(SKILL_SHEET_ROWS)}
+
+
+def skill_frames(skill_data, direction):
+    """Scaled frames of a skill's sheet facing `direction`; each sheet/scale is sliced once per run."""
+    key = (skill_data.animation_path, skill_data.frames, skill_data.scale)
+    frame_set = _frame_sets.get(key)
+    if frame_set is None:
+        frame_set = _frame_sets[key] = build_frame_set(*key)
+    return frame_set.get(direction, frame_set["down"])
+
+
+def preload_skill_frames():
+    """Builds the frame sets of every skill and combo variant (call once the display mode is set)."""
+    from skills_database import skill_database, skill_variants
+    for skill in (*skill_database.values(), *skill_variants.values()):
+        if skill.animation_path:
+            skill_frames(skill, "down")
+
 
 class SkillEffect(pygame.sprite.Sprite):
     def __init__(self, skill_data, origin_source, direction, current_time):
@@ -16,7 +78,7 @@ class SkillEffect(pygame.sprite.Sprite):
         self.duration_override = getattr(skill_data, "duration_override", None)
         self.last_update = current_time
         self.spawn_time = current_time
-        self.scale = getattr(skill_data, 'scale', 3)
+        self.scale = skill_data.scale
         self.damage = skill_data.damage
         self.follow_caster = skill_data.follow_caster
 
@@ -28,7 +90,7 @@ class SkillEffect(pygame.sprite.Sprite):
             self.origin_entity = None
             self.origin_pos = origin_source  # (x, y)
 
-        self.load_frames(skill_data.animation_path, skill_data.frames, direction)
+        self.frames = skill_frames(skill_data, direction)
 
         if self.frames:
             self.image = self.frames[self.frame_index]
@@ -42,30 +104,6 @@ class SkillEffect(pygame.sprite.Sprite):
 
 
 
-    def load_frames(self, sprite_path, num_frames, direction):
-        if not sprite_path or not os.path.isfile(sprite_path):
-            self.frames = []
-            return
-        sheet = pygame.image.load(sprite_path).convert_alpha()
-        frame_width = 64
-        frame_height = 64
-        directions_map = {"right": 0, "left": 1, "up": 2, "down": 3}
-        row = directions_map.get(direction, 3)
-
-        self.frames = []
-        for i in range(num_frames):
-            x = i * frame_width
-            y = row * frame_height
-            frame_rect = pygame.Rect(x, y, frame_width, frame_height)
-            frame_surface = pygame.Surface((frame_width, frame_height), pygame.SRCALPHA)
-            frame_surface.blit(sheet, (0, 0), frame_rect)
-
-            scaled = pygame.transform.scale(
-                frame_surface,
-                (int(frame_width * self.scale), int(frame_height * self.scale))
-            )
-            self.frames.append(scaled)
-
     def set_position(self, direction):
         if self.follow_caster:
             ox, oy = self.origin_entity.rect.center
@@ -102,10 +140,11 @@ class SkillEffect(pygame.sprite.Sprite):
             self.set_position(self.direction)
 
     def draw(self, screen):
-        screen.blit(self.image, self.rect.topleft)
+        area = screen.blit(self.image, self.rect.topleft)
 
         if SHOW_HITBOX_PLAYER:
-            pygame.draw.rect(screen, (255, 0, 0), self.hitbox, 2)
+            area.union_ip(pygame.draw.rect(screen, (255, 0, 0), self.hitbox, 2))
+        return area
 
 import pygame
 import math
@@ -114,14 +153,23 @@ import random
 
 class Projectile:
     def __init__(self, x, y, direction, speed, skill_data):
+        self.font = get_font(CINZEL_FONT, 36)
+        self.trail = []
+        self.reset(x, y, direction, speed, skill_data)
+
+    def reset(self, x, y, direction, speed, skill_data):
         self.start_x = x
         self.start_y = y
         self.x = x
         self.y = y
+        self.prev_x = x
+        self.prev_y = y
+        self.sweep_x = x  # where this tick's move started; hits are swept from here to (x, y)
+        self.sweep_y = y
         self.dir = direction
         self.speed = speed
         self.skill_data = skill_data
-        self.is_max_combo = getattr(skill_data, "is_max_combo", False)
+        self.is_max_combo = skill_data.is_max_combo
         self.damage = skill_data.damage
         self.max_range = 600
         self.alive = True
@@ -133,10 +181,9 @@ class Projectile:
 
         self.angle = 0
         self.pulse = 0
-        self.font = pygame.font.Font("assets/fonts/Cinzel-Regular.ttf", 36)
-        self.note_surface = self.font.render("𝄞", True, self.note_color)
+        self.note_surface = text_cache.render(self.font, "𝄞", self.note_color)
 
-        self.trail = []
+        self.trail.clear()
 
         if direction == "up": self.dx, self.dy = 0, -1
         elif direction == "down": self.dx, self.dy = 0, 1
@@ -144,65 +191,90 @@ class Projectile:
         elif direction == "right": self.dx, self.dy = 1, 0
         else: self.dx, self.dy = 0, 0
 
-    def update(self, dt):
-        self.x += self.dx * self.speed * dt / 16
-        self.y += self.dy * self.speed * dt / 16
+    def remember_position(self):
+        self.prev_x = self.x
+        self.prev_y = self.y
 
-        if random.random() < 0.6:
-            self.trail.append([self.x, self.y, random.randint(3, 5), 200])
+    def update(self, dt):
+        step = dt / 16
+        self.sweep_x = self.x
+        self.sweep_y = self.y
+        self.x += self.dx * self.speed * step
+        self.y += self.dy * self.speed * step
+
+        # trail and spin were tuned when projectiles were stepped twice a frame (update and draw),
+        # so the emission chance scales with the tick length like the movement does
+        for _ in range(2):
+            if random.random() < 0.6 * step:
+                self.trail.append([self.x, self.y, random.randint(3, 5), 200])
         self.trail = [t for t in self.trail if t[3] > 0]
         for t in self.trail:
-            t[3] -= 12
+            t[3] -= 24 * step
 
-        self.angle += 3
-        self.pulse = 3 * math.sin(pygame.time.get_ticks() * 0.008)
+        self.angle += 6 * step
+        self.pulse = 3 * math.sin(game_clock.get_ticks() * 0.008)
 
         dist = math.hypot(self.x - self.start_x, self.y - self.start_y)
         if dist > self.max_range:
             self.alive = False
 
-    def check_collision(self, enemies, effect_manager):
-        for enemy in enemies:
-            if enemy.hitbox.collidepoint(self.x, self.y) and not enemy.is_dead():
-                enemy.take_damage(self.damage)
-                self.alive = False
-                effect_manager.spawn_impact(self.x, self.y)
-                break
+    def segment(self):
+        """This tick's move as (x0, y0, x1, y1), cut off where the projectile reaches max_range."""
+        x, y = self.x, self.y
+        dist = math.hypot(x - self.start_x, y - self.start_y)
+        if dist > self.max_range:
+            scale = self.max_range / dist
+            x = self.start_x + (x - self.start_x) * scale
+            y = self.start_y + (y - self.start_y) * scale
+        return self.sweep_x, self.sweep_y, x, y
+
+    def strike(self, enemy, t, effect_manager):
+        """Hits `enemy` `t` (0..1) of the way along this tick's move and ends the projectile there."""
+        x0, y0, x1, y1 = self.segment()
+        self.x = x0 + (x1 - x0) * t
+        self.y = y0 + (y1 - y0) * t
+        enemy.take_damage(self.damage)
+        self.alive = False
+        effect_manager.spawn_impact(self.x, self.y)
 
     def draw(self, screen):
         self.base_radius = 16 if not self.is_max_combo else 28
-        self.note_surface = self.font.render("𝄞", True, (180, 220, 255) if not self.is_max_combo else (255, 100, 255))
+        self.note_surface = text_cache.render(self.font, "𝄞", (180, 220, 255) if not self.is_max_combo else (255, 100, 255))
+        x, y = game_clock.interpolate((self.prev_x, self.prev_y), (self.x, self.y))
 
         for i in range(2, 0, -1):
-            glow_surface = pygame.Surface((60, 60), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface,
-                (self.glow_color[0], self.glow_color[1], self.glow_color[2], self.glow_color[3] // i),
-                (30, 30), self.base_radius + i * 4 + int(self.pulse))
-            screen.blit(glow_surface, (self.x - 30, self.y - 30), special_flags=pygame.BLEND_RGBA_ADD)
+            glow_surface = glow_cache.circle(self.base_radius + i * 4 + int(self.pulse),
+                                             self.glow_color, self.glow_color[3] // i, canvas=60)
+            area = screen.blit(glow_surface, (x - 30, y - 30), special_flags=pygame.BLEND_RGBA_ADD)
 
         for tx, ty, size, alpha in self.trail:
             alpha = max(0, min(255, int(alpha)))
-            trail_surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(trail_surf, (*self.trail_color, alpha), (size, size), size)
+            trail_surf = glow_cache.circle(size, self.trail_color, alpha)
             screen.blit(trail_surf, (tx - size, ty - size), special_flags=pygame.BLEND_RGBA_ADD)
 
         rotated = pygame.transform.rotate(self.note_surface, self.angle)
-        rect = rotated.get_rect(center=(self.x, self.y))
-        screen.blit(rotated, rect.topleft)
+        rect = rotated.get_rect(center=(x, y))
+        area.union_ip(screen.blit(rotated, rect.topleft))
+        trail_area = particle_bounds(self.trail, 6)
+        if trail_area:
+            area.union_ip(trail_area)
+        return area
 
 class CrescendoEffect:
-    def __init__(self, player, duration):
+    """Emitter orbiting the player; its particles live in the manager's shared crescendo system."""
+
+    def __init__(self, player, duration, particles):
         self.player = player
         self.duration = duration
-        self.start_time = pygame.time.get_ticks()
+        self.start_time = game_clock.get_ticks()
         self.finished = False
-        self.particles = []
+        self.particles = particles
         self.orbit_angle = 0.0
         self.spawn_interval = 50  # ms
         self.last_spawn_time = self.start_time
 
     def update(self):
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
 
         # 🎯 ครบระยะ → หยุด
         if now - self.start_time >= self.duration:
@@ -225,26 +297,7 @@ class CrescendoEffect:
             size = random.randint(2, 4)
             color = (200, 50, 50)
             lifetime = random.randint(400, 700)
-            self.particles.append([x, y, dx, dy, lifetime, size, color])
-
-        # 🎐 update movement
-        self.particles = [
-            [x + dx, y + dy, dx, dy, lifetime - 16, size, color]
-            for x, y, dx, dy, lifetime, size, color in self.particles if lifetime > 0
-        ]
-
-    def draw(self, screen):
-        for x, y, _, _, lifetime, size, color in self.particles:
-            alpha = max(0, min(180, int(lifetime / 600 * 140)))
-            glow_radius = size + 3
-
-            # 🌫️ Glow เบา
-            glow_surf = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (*color, int(alpha * 0.25)), (glow_radius, glow_radius), glow_radius)
-            screen.blit(glow_surf, (x - glow_radius, y - glow_radius), special_flags=pygame.BLEND_RGBA_MULT)
-
-            # 💡 Core particle
-            pygame.draw.circle(screen, (*color, alpha), (int(x), int(y)), size)
+            self.particles.emit(x, y, dx, dy, lifetime, size, color)
 
 class SoundquakeEffect:
     def __init__(self, origin, radius, damage, charge_ratio, font, note_char):
@@ -254,13 +307,14 @@ class SoundquakeEffect:
         self.charge_ratio = charge_ratio
         self.font = font
         self.note_char = note_char
-        self.spawn_time = pygame.time.get_ticks()
+        self.spawn_time = game_clock.get_ticks()
         self.duration = 600  # milliseconds
         self.alpha_decay_rate = 255 / self.duration
         self.notes = []
         self.rotation = 0
         self.generate_notes()
         self.alive = True  # ✅ สำคัญ
+        self.already_hit = set()  # enemies the wave has damaged; it hits each one once
 
     def generate_notes(self):
         num_notes = int(5 + self.charge_ratio * 5)
@@ -276,13 +330,14 @@ class SoundquakeEffect:
 
     def update(self, dt):
         self.rotation += dt * 0.005  # radians
+        if game_clock.get_ticks() - self.spawn_time > self.duration:
+            self.alive = False
 
     def draw(self, surface):
-        now = pygame.time.get_ticks()
+        now = game_clock.get_ticks()
         elapsed = now - self.spawn_time
         if elapsed > self.duration:
-            self.alive = False
-            return False
+            return None
 
         alpha = max(0, 255 - int(elapsed * self.alpha_decay_rate))
         x, y = self.origin
@@ -290,8 +345,7 @@ class SoundquakeEffect:
         # 🎆 Glow ขยายเป็นชั้น ๆ
         for i in range(6, 0, -1):
             r = int(self.radius * (i / 6))
-            glow_surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surf, (120, 100, 255, int(alpha * (i / 6))), (r, r), r)
+            glow_surf = glow_cache.circle(r, (120, 100, 255), alpha * (i / 6))
             surface.blit(glow_surf, (x - r, y - r), special_flags=pygame.BLEND_PREMULTIPLIED)
 
         # 🎵 วาดโน้ตหมุนรอบ
@@ -300,88 +354,62 @@ class SoundquakeEffect:
             note_radius = self.radius + note["radius_offset"]
             nx = x + int(note_radius * math.cos(angle))
             ny = y + int(note_radius * math.sin(angle))
-            txt = self.font.render(note["char"], True, (190, 150, 255))
+            txt = text_cache.render(self.font, note["char"], (190, 150, 255)).copy()
             txt.set_alpha(alpha)
             surface.blit(txt, txt.get_rect(center=(nx, ny)))
 
-        return True
+        # notes orbit up to 10px past the radius and are at most ~30px tall
+        reach = int(self.radius) + 40
+        return pygame.Rect(x - reach, y - reach, reach * 2, reach * 2)
 
-    def check_collision(self, enemies, manager):
-        for enemy in enemies:
-            distance = math.hypot(enemy.rect.centerx - self.origin[0], enemy.rect.centery - self.origin[1])
-            if distance < self.radius:
-                enemy.take_damage(self.damage)
+    def check_collision(self, enemy_manager, manager):
+        for enemy in enemy_manager.enemies_in_radius(self.origin, self.radius):
+            # a hurt enemy ignores the hit, so it stays unregistered until one lands
+            if enemy not in self.already_hit and enemy.take_damage(self.damage):
+                self.already_hit.add(enemy)
 
 class HealEffect:
-    def __init__(self, target_rect):
-        self.particles = []
-        for _ in range(25):
-            angle = random.uniform(0, 2 * math.pi)
-            radius = random.uniform(10, 40)
-            speed = random.uniform(0.5, 1.5)
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            size = random.randint(2, 5)
-            color = (180, 255, 180)
-            lifetime = random.randint(500, 1000)
-            self.particles.append([target_rect.centerx, target_rect.centery, dx, dy, lifetime, size, color])
-        self.finished = False
+    """Heal sparkle: every cast bursts 25 green motes into one shared particle system."""
 
-    def update(self):
-        self.particles = [
-            [x + dx, y + dy, dx, dy, lifetime - 16, size, color]
-            for x, y, dx, dy, lifetime, size, color in self.particles if lifetime > 0
-        ]
-        if not self.particles:
-            self.finished = True
+    def __init__(self):
+        self.particles = ParticleSystem(fade_ms=1000)
+
+    def emit(self, target_rect):
+        self.particles.emit_burst(target_rect.centerx, target_rect.centery, 25,
+                                  speed=(0.5, 1.5), life=(500, 1000), size=(2, 5), color=(180, 255, 180))
+
+    def update(self, dt):
+        self.particles.update(dt)
 
     def draw(self, screen):
-        for x, y, _, _, lifetime, size, color in self.particles:
-            alpha = max(0, min(255, int(lifetime / 1000 * 255)))
-            surf = pygame.Surface((size*2, size*2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*color, alpha), (size, size), size)
-            screen.blit(surf, (x - size, y - size))
+        return self.particles.draw(screen)
 
 class ImpactEffect:
-    def __init__(self, x, y):
-        self.particles = []
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1.0, 3.5)
-            dx = math.cos(angle) * speed
-            dy = math.sin(angle) * speed
-            lifetime = random.randint(300, 500)
-            size = random.randint(3, 6)
-            color = (255, 200, 255)
-            self.particles.append([x, y, dx, dy, lifetime, size, color])
-        self.start_time = pygame.time.get_ticks()
-        self.finished = False
+    """Projectile hit burst: 10 pink sparks per impact, all in one shared particle system."""
 
-    def update(self):
-        now = pygame.time.get_ticks()
-        self.particles = [
-            [x + dx, y + dy, dx, dy, lifetime - 16, size, color]
-            for x, y, dx, dy, lifetime, size, color in self.particles if lifetime > 0
-        ]
-        if not self.particles:
-            self.finished = True
+    def __init__(self):
+        self.particles = ParticleSystem(fade_ms=500)
+
+    def emit(self, x, y):
+        self.particles.emit_burst(x, y, 10, speed=(1.0, 3.5), life=(300, 500), size=(3, 6), color=(255, 200, 255))
+
+    def update(self, dt):
+        self.particles.update(dt)
 
     def draw(self, screen):
-        for x, y, dx, dy, lifetime, size, color in self.particles:
-            alpha = max(0, min(255, int(lifetime / 500 * 255)))
-            surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*color, alpha), (size, size), size)
-            screen.blit(surf, (x - size, y - size))
+        return self.particles.draw(screen)
 
 
 class SkillEffectManager:
     def __init__(self):
         self.effects = pygame.sprite.Group()
-        self.damage_texts = []
+        self.damage_texts = DamageTextPool()
         self.projectiles = []
-        self.impact_effects = []
-        self.heal_effects = []
+        self.projectile_pool = ObjectPool(Projectile, PROJECTILE_POOL_SIZE)
+        self.impacts = ImpactEffect()
+        self.heals = HealEffect()
         self.crescendo_effects = []
+        self.crescendo_particles = ParticleSystem(fade_ms=600, peak_alpha=140, max_alpha=180)
 
     def spawn(self, skill, origin_entity, direction, current_time):
         if not skill.animation_path:
@@ -393,52 +421,88 @@ class SkillEffectManager:
         self.effects.add(effect)
 
     def spawn_heal_effect(self, player):
-        self.heal_effects.append(HealEffect(player.rect))
+        self.heals.emit(player.rect)
 
     def spawn_crescendo_effect(self, player):
-        self.crescendo_effects.append(CrescendoEffect(player, duration=5000))
+        self.crescendo_effects.append(CrescendoEffect(player, 5000, self.crescendo_particles))
 
     def cast_note_flurry(self, player, override_skill=None):
         from skills_database import skill_database
         skill = override_skill or skill_database["note_flurry"]
-        proj = Projectile(player.rect.centerx, player.rect.centery, player.direction, 8, skill)
+        proj = self.projectile_pool.acquire(player.rect.centerx, player.rect.centery, player.direction, 8, skill)
         self.projectiles.append(proj)
 
-    def update_projectiles(self, screen, enemies, dt):
-        for proj in self.projectiles[:]:
+    def update_projectiles(self, enemy_manager, dt):
+        """Moves projectiles and Soundquakes one tick and resolves their hits."""
+        moved = []
+        for proj in self.projectiles:
             if hasattr(proj, "check_collision"):
-                proj.check_collision(enemies, self)
-                proj.update(dt)
-                proj.draw(screen)
-                if not proj.alive:
-                    self.projectiles.remove(proj)
-            elif isinstance(proj, SoundquakeEffect):
-                proj.update(dt, enemies)
-                proj.draw(screen)
-                if not proj.active:
-                    self.projectiles.remove(proj)
-
-        for effect in self.impact_effects[:]:
-            effect.update()
-            effect.draw(screen)
-            if effect.finished:
-                self.impact_effects.remove(effect)
-    def check_skill_hits(self, enemies):
+                proj.check_collision(enemy_manager, self)
+            if isinstance(proj, Projectile):
+                moved.append(proj)
+            proj.update(dt)
+        self.resolve_projectile_hits(moved, enemy_manager)
+        for proj in self.projectiles[:]:
+            if not proj.alive:
+                self.projectiles.remove(proj)
+                if isinstance(proj, Projectile):
+                    self.projectile_pool.release(proj)
+        self.impacts.update(dt)
+
+    def resolve_projectile_hits(self, projectiles, enemy_manager):
+        """Sweeps every projectile's move this tick against the enemies in one pass.
+
+        Testing the whole segment instead of the end point means a hit doesn't
+        depend on how far a projectile moves per tick, so fast shots and long
+        ticks can't skip over a hitbox.
+        """
+        if not projectiles:
+            return
+        hits = enemy_manager.sweep([proj.segment() for proj in projectiles])
+        for proj, hit in zip(projectiles, hits):
+            if hit is not None and hit[0].playing_death:
+                # an earlier shot this tick killed it; look for whatever is behind it
+                hit = enemy_manager.sweep([proj.segment()])[0]
+            if hit is not None:
+                proj.strike(hit[0], hit[1], self)
+
+    def draw_projectiles(self, screen):
+        """Draws projectiles and impacts; returns the areas drawn."""
+        areas = [proj.draw(screen) for proj in self.projectiles]
+        areas.append(self.impacts.draw(screen))
+        return areas
+
+    def remember_positions(self):
+        for proj in self.projectiles:
+            if isinstance(proj, Projectile):
+                proj.remember_position()
+    def check_skill_hits(self, enemy_manager):
+        """Damages each enemy an effect's hitbox touches once; only enemies in the hitbox's grid cells are tested."""
         for effect in self.effects:
-            for enemy in enemies:
+            for enemy in enemy_manager.enemies_in_rect(effect.hitbox):
                 if not enemy.alive:
                     continue
                 if enemy in effect.already_hit:
                     continue  # ข้ามศัตรูที่โดนไปแล้ว
-                if effect.hitbox.colliderect(enemy.hitbox):
-                    enemy.take_damage(effect.damage)
-                    effect.already_hit.add(enemy)
-                    # 🎯 เพิ่มเลข damage popup ตรงกลาง enemy
-                    center = enemy.rect.center
-                    self.damage_texts.append(FloatingDamageText(effect.damage, (center[0], center[1] - 30)))
+                enemy.take_damage(effect.damage)
+                effect.already_hit.add(enemy)
+                # 🎯 เพิ่มเลข damage popup ตรงกลาง enemy
+                center = enemy.rect.center
+                self.damage_texts.spawn(effect.damage, (center[0], center[1] - 30))
 
     def spawn_impact(self, x, y):
-        self.impact_effects.append(ImpactEffect(x, y))
+        self.impacts.emit(x, y)
+
+    def pool_stats(self):
+        return {
+            "projectile": self.projectile_pool.stats(),
+            "damage_text": self.damage_texts.pool.stats(),
+            "particles": {
+                "impact": len(self.impacts.particles),
+                "heal": len(self.heals.particles),
+                "crescendo": len(self.crescendo_particles),
+            },
+        }
 
     def add_effect(self, effect):
         """
@@ -446,30 +510,28 @@ class SkillEffectManager:
         """
         self.projectiles.append(effect)
 
-    def update(self, current_time: int):
+    def update(self, current_time: int, dt):
         self.effects.update(current_time)
-        for eff in self.heal_effects:
-            eff.update()
-        self.heal_effects = [e for e in self.heal_effects if not e.finished]
+        self.heals.update(dt)
 
         for eff in self.crescendo_effects:
             eff.update()
         self.crescendo_effects = [e for e in self.crescendo_effects if not e.finished]
+        self.crescendo_particles.update(dt)
 
         # อัปเดต damage texts
-        for dmg_text in self.damage_texts:
-            dmg_text.update()
-        self.damage_texts = [d for d in self.damage_texts if not d.is_expired()]
+        self.damage_texts.update(dt)
 
     def draw_crescendo_only(self, screen):
-        for eff in self.crescendo_effects:
-            eff.draw(screen)
+        particles = self.crescendo_particles
+        # 🌫️ Glow เบา แล้วค่อยวาดแกนทึบทับ
+        glow = particles.draw(screen, size_offset=3, alpha_scale=0.25, special_flags=pygame.BLEND_RGBA_MULT)
+        core = particles.draw(screen, opaque=True)
+        return [glow, core]
 
     def draw(self, screen):
-        for effect in self.effects:
-            effect.draw(screen)
-        for eff in self.heal_effects:
-            eff.draw(screen)
+        areas = [effect.draw(screen) for effect in self.effects]
+        areas.append(self.heals.draw(screen))
 
-        for dmg_text in self.damage_texts:
-            dmg_text.draw(screen)
\ No newline at end of file
+        areas += self.damage_texts.draw(screen)
+        return areas
\ No newline at end of file
@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Dict, Tuple, Optional
 from note_type import NoteType
 
-@dataclass
+@dataclass(frozen=True)
 class SkillData:
     name: str
     animation_path: Optional[str]
@@ -21,6 +21,9 @@ class SkillData:
     radius_bonus: Optional[int] = None  # additional radius by charge
     bonus_damage: Optional[int] = None
 
+    scale: int = 3  # sprite scale of the skill effect
+    is_max_combo: bool = False  # Projectile draws and sizes MAX shots differently
+
 
 skill_database = {
     "strike_beat": SkillData(
@@ -125,3 +128,35 @@ skill_database = {
         duration=5000
     ),
 }
+
+
+def derive_skill(base, name, requirement, damage_multiplier=1, scale=None, **flags):
+    """A frozen copy of `base` with its damage multiplied and its effect offsets rescaled to `scale`."""
+    scale = scale or base.scale
+    offsets = base.effect_offsets
+    if offsets and scale != base.scale:
+        offsets = {direction: (int(dx * scale / base.scale), int(dy * scale / base.scale))
+                   for direction, (dx, dy) in offsets.items()}
+    return replace(base, name=name, requirement=requirement, damage=base.damage * damage_multiplier,
+                   scale=scale, effect_offsets=offsets, **flags)
+
+
+# Stronger versions of a skill fired by combos, built once here: skill key -> (base skill key, derive_skill arguments).
+# Kept out of skill_database so they don't get their own cooldown line in the HUD
+variant_declarations = {
+    "strike_beat_max": ("strike_beat", dict(name="Strike Beat MAX", requirement={NoteType.QUARTER: 4},
+                                            damage_multiplier=2, scale=4)),
+    "note_flurry_max": ("note_flurry", dict(name="Note Flurry MAX", requirement={NoteType.EIGHTH: 8},
+                                            damage_multiplier=2, is_max_combo=True)),
+}
+skill_variants = {key: derive_skill(skill_database[base], **args)
+                  for key, (base, args) in variant_declarations.items()}
+
+# Combos ComboTracker recognises. A requirement is read as notes to play in order:
+# keys in declaration order, each repeated `count` times (crescendo = HALF, QUARTER, EIGHTH, EIGHTH)
+combo_database = {
+    "heal_note": skill_database["heal_note"].requirement,
+    "strike_beat_max": skill_variants["strike_beat_max"].requirement,
+    "note_flurry_max": skill_variants["note_flurry_max"].requirement,
+    "crescendo": skill_database["crescendo"].requirement,
+}
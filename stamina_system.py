@@ -1,4 +1,5 @@
 import pygame
+import game_clock
 
 
 class StaminaSystem:
@@ -29,7 +30,7 @@ class StaminaSystem:
 
     def use_stamina(self, amount):
         self.current_stamina = max(0, self.current_stamina - amount)
-        self.last_stamina_use = pygame.time.get_ticks()
+        self.last_stamina_use = game_clock.get_ticks()
 
     def get_stamina_ratio(self):
         return self.current_stamina / self.max_stamina
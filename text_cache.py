@@ -0,0 +1,83 @@
+from collections import OrderedDict
+import pygame
+from settings import TEXT_CACHE_MAX_BYTES
+
+OUTLINE_OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+class SurfaceCache:
+    """LRU cache of pre-rendered surfaces, bounded by total pixel memory.
+
+    Returned surfaces are shared between callers: don't draw on them or call
+    set_alpha on them directly, take a .copy() first if a per-use alpha is needed.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (surface, size_in_bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def _put(self, key, surface):
+        size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+        self.entries[key] = (surface, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.bytes -= evicted
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+
+class TextCache(SurfaceCache):
+    """Rendered text keyed by (font, text, color, antialias), plus outlined and scaled variants."""
+
+    def __init__(self, max_bytes=TEXT_CACHE_MAX_BYTES):
+        super().__init__(max_bytes)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self._get(key)
+        if surface is None:
+            surface = self._put(key, font.render(text, antialias, color))
+        return surface
+
+    def render_outlined(self, font, text, color, outline_color=(255, 255, 255), antialias=True):
+        """Text with a 1px outline, composited into a single surface (offset by 1px on each side)."""
+        key = ("outline", font, text, color, outline_color, antialias)
+        surface = self._get(key)
+        if surface is None:
+            fill = self.render(font, text, color, antialias)
+            edge = self.render(font, text, outline_color, antialias)
+            surface = pygame.Surface((fill.get_width() + 2, fill.get_height() + 2), pygame.SRCALPHA)
+            for dx, dy in OUTLINE_OFFSETS:
+                surface.blit(edge, (1 + dx, 1 + dy))
+            surface.blit(fill, (1, 1))
+            surface = self._put(key, surface)
+        return surface
+
+    def render_scaled(self, font, text, color, height, antialias=True):
+        """Text smooth-scaled to a fixed height, keeping its aspect ratio."""
+        key = ("scaled", font, text, color, height, antialias)
+        surface = self._get(key)
+        if surface is None:
+            base = self.render(font, text, color, antialias)
+            width = int(base.get_width() * (height / base.get_height()))
+            surface = self._put(key, pygame.transform.smoothscale(base, (width, height)))
+        return surface
+
+
+text_cache = TextCache()